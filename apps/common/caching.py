@@ -0,0 +1,133 @@
+import time
+from hashlib import md5
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .conditional import make_etag
+
+
+def _free_slots_version_key(stadium_id):
+    return f"free-slots:version:{stadium_id}"
+
+
+def free_slots_key(stadium_id, date_from, date_to):
+    version = cache.get_or_set(_free_slots_version_key(stadium_id), time.time_ns(), None)
+    return f"free-slots:{stadium_id}:{version}:{date_from}:{date_to}"
+
+
+def get_free_slots(stadium_id, date_from, date_to, compute):
+    key = free_slots_key(stadium_id, date_from, date_to)
+    data = cache.get(key)
+    if data is None:
+        data = compute()
+        cache.set(key, data, settings.FREE_SLOTS_CACHE_TIMEOUT)
+    return data
+
+
+def invalidate_free_slots(stadium_id):
+    cache.set(_free_slots_version_key(stadium_id), time.time_ns(), None)
+
+
+STADIUM_LIST_VERSION_KEY = "stadium-list:version"
+# Bumped by booking changes, which only pages filtered by availability depend on.
+STADIUM_AVAILABILITY_VERSION_KEY = "stadium-list:availability-version"
+AVAILABILITY_PARAMS = ('available_from', 'available_to')
+
+
+def _stadium_list_version_keys(request):
+    if any(request.query_params.get(param) for param in AVAILABILITY_PARAMS):
+        return (STADIUM_LIST_VERSION_KEY, STADIUM_AVAILABILITY_VERSION_KEY)
+    return (STADIUM_LIST_VERSION_KEY,)
+
+
+def stadium_list_versions(request):
+    return [cache.get_or_set(key, time.time_ns(), None) for key in _stadium_list_version_keys(request)]
+
+
+async def astadium_list_versions(request):
+    return [await cache.aget_or_set(key, time.time_ns(), None) for key in _stadium_list_version_keys(request)]
+
+
+def stadium_list_key(request):
+    return _stadium_list_key(request, stadium_list_versions(request))
+
+
+async def astadium_list_key(request):
+    return _stadium_list_key(request, await astadium_list_versions(request))
+
+
+def _stadium_list_key(request, versions):
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+        if value != ''
+    )
+    # The absolute URL is part of the key because pagination links and image
+    # URLs in the payload are built from the request host.
+    url = f"{request.build_absolute_uri(request.path)}?{urlencode(params)}"
+    return f"stadium-list:{'-'.join(map(str, versions))}:{md5(url.encode()).hexdigest()}"
+
+
+def get_stadium_list(request, compute):
+    key = stadium_list_key(request)
+    data = cache.get(key)
+    if data is None:
+        data = compute()
+        cache.set(key, data, settings.STADIUM_LIST_CACHE_TIMEOUT)
+    return data
+
+
+async def aget_stadium_list(request, compute):
+    key = await astadium_list_key(request)
+    data = await cache.aget(key)
+    if data is None:
+        data = await compute()
+        await cache.aset(key, data, settings.STADIUM_LIST_CACHE_TIMEOUT)
+    return data
+
+
+def _stadium_list_validators(key, versions, modified, count):
+    # Deletions and bookings leave no updated_at behind, but they bump a version.
+    last_modified = max(modified.timestamp() if modified else 0, max(versions) / 10 ** 9)
+    return make_etag(key, modified, count), int(last_modified)
+
+
+def get_stadium_list_validators(request, compute):
+    """
+    Returns the (etag, last_modified) pair of the list page `request` asks
+    for. compute() gives the latest updated_at and the row count of the
+    filtered stadiums; the result is cached next to the page itself.
+    """
+    versions = stadium_list_versions(request)
+    key = f"{_stadium_list_key(request, versions)}:validators"
+    validators = cache.get(key)
+    if validators is None:
+        validators = _stadium_list_validators(key, versions, *compute())
+        cache.set(key, validators, settings.STADIUM_LIST_CACHE_TIMEOUT)
+    return validators
+
+
+async def aget_stadium_list_validators(request, compute):
+    versions = await astadium_list_versions(request)
+    key = f"{_stadium_list_key(request, versions)}:validators"
+    validators = await cache.aget(key)
+    if validators is None:
+        validators = _stadium_list_validators(key, versions, *await compute())
+        await cache.aset(key, validators, settings.STADIUM_LIST_CACHE_TIMEOUT)
+    return validators
+
+
+def stadium_list_changed_within(seconds):
+    version = cache.get(STADIUM_LIST_VERSION_KEY)
+    return version is not None and time.time_ns() - version < seconds * 10 ** 9
+
+
+def invalidate_stadium_list():
+    cache.set(STADIUM_LIST_VERSION_KEY, time.time_ns(), None)
+
+
+def invalidate_stadium_availability():
+    cache.set(STADIUM_AVAILABILITY_VERSION_KEY, time.time_ns(), None)
@@ -0,0 +1,190 @@
+import csv
+import io
+import math
+import random
+from collections import defaultdict
+from datetime import datetime, time as dt_time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.user.models import User
+from .caching import invalidate_stadium_list
+from .geo import geohash_encode
+from .models import Stadium, Bron, Team, StadiumCounter, StadiumDailyStats
+
+PASSWORD = 'benchmark01'
+STADIUMS_PER_OWNER = 3
+OPENING_HOUR = 8
+CLOSING_HOUR = 23
+PHONE_PREFIXES = {'owner': '90', 'manager': '91', 'user': '92'}
+BRON_COLUMNS = ('created_at', 'updated_at', 'user_id', 'team_id', 'stadium_id',
+                'start_time', 'end_time', 'is_paid', 'order_type', 'price_hour')
+
+
+class DataGenerator:
+    """
+    Bulk-loads synthetic users, teams, stadiums and bookings.
+
+    Bookings are laid out per stadium by walking forward through opening
+    hours, so they never overlap and always last whole hours; each owner
+    gets at most three stadiums. Rows are written in batches with
+    bulk_create, or with COPY on PostgreSQL when `use_copy` is set, and
+    the rollups that signals would normally maintain are filled in directly.
+    """
+
+    def __init__(self, stadiums, users, brons_per_stadium, days_back=365, batch_size=5000,
+                 use_copy=False, seed=0, log=None):
+        self.stadium_count = stadiums
+        self.user_count = max(users, 1)
+        self.brons_per_stadium = brons_per_stadium
+        self.first_day = timezone.localdate() - timedelta(days=days_back)
+        self.batch_size = batch_size
+        self.use_copy = use_copy and connection.vendor == 'postgresql'
+        self.random = random.Random(seed)
+        self.log = log or (lambda message: None)
+        self.password = make_password(PASSWORD)
+
+    def run(self):
+        owners = self.create_users('owner', math.ceil(self.stadium_count / STADIUMS_PER_OWNER))
+        managers = self.create_users('manager', self.stadium_count)
+        users = self.create_users('user', self.user_count)
+        teams = self.create_teams(users)
+        stadiums = self.create_stadiums(owners, managers)
+        total = self.create_brons(stadiums, users, teams)
+        StadiumCounter.recompute()
+        invalidate_stadium_list()
+        return {
+            'owners': len(owners),
+            'managers': len(managers),
+            'users': len(users),
+            'teams': len(teams),
+            'stadiums': len(stadiums),
+            'brons': total,
+        }
+
+    def create_users(self, role, count):
+        prefix = PHONE_PREFIXES[role]
+        # Continue numbering after earlier runs so phone numbers stay unique.
+        offset = User.objects.filter(phone_number__startswith=f'+998{prefix}').count()
+        users = User.objects.bulk_create([
+            User(
+                phone_number=f'+998{prefix}{offset + i:07d}',
+                full_name=f'{role.title()} {offset + i}',
+                role=role,
+                password=self.password,
+            )
+            for i in range(count)
+        ], batch_size=self.batch_size)
+        self.log(f'{count} {role}s')
+        return users
+
+    def create_teams(self, users):
+        # Every tenth user owns a team made up of the next few users.
+        teams = Team.objects.bulk_create([
+            Team(name=f'Team {user.full_name}', owner=user) for user in users[::10]
+        ], batch_size=self.batch_size)
+        Membership = Team.members.through
+        Membership.objects.bulk_create([
+            Membership(team=team, user=member)
+            for index, team in enumerate(teams)
+            for member in users[index * 10 + 1:index * 10 + 6]
+        ], batch_size=self.batch_size)
+        self.log(f'{len(teams)} teams')
+        return teams
+
+    def create_stadiums(self, owners, managers):
+        stadiums = []
+        for i, manager in enumerate(managers):
+            stadium = Stadium(
+                owner=owners[i // STADIUMS_PER_OWNER],
+                manager=manager,
+                name=f'Stadium {manager.full_name.split()[-1]}',
+                latitude=Decimal('41.2') + Decimal(self.random.randrange(0, 20000)) / 100000,
+                longitude=Decimal('69.1') + Decimal(self.random.randrange(0, 30000)) / 100000,
+                price_hour=Decimal(self.random.randrange(80, 300) * 1000),
+                is_active=self.random.random() > 0.1,
+            )
+            stadium.geohash = geohash_encode(stadium.latitude, stadium.longitude)
+            stadium.search_document = stadium.build_search_document()
+            stadiums.append(stadium)
+        stadiums = Stadium.objects.bulk_create(stadiums, batch_size=self.batch_size)
+        self.log(f'{len(stadiums)} stadiums')
+        return stadiums
+
+    def bron_rows(self, stadium, users, teams):
+        """Non-overlapping whole-hour bookings of one stadium, in time order, with their local day."""
+        tz = timezone.get_current_timezone()
+        day = self.first_day
+        hour = OPENING_HOUR
+        for _ in range(self.brons_per_stadium):
+            hour += self.random.choice((0, 0, 1, 2, 3))
+            duration = self.random.choice((1, 1, 1, 2, 2, 3))
+            if hour + duration > CLOSING_HOUR:
+                day += timedelta(days=1)
+                hour = OPENING_HOUR
+            start = datetime.combine(day, dt_time(hour), tzinfo=tz)
+            hour += duration
+
+            team = self.random.choice(teams) if teams and self.random.random() < 0.3 else None
+            user = team.owner if team else self.random.choice(users)
+            yield day, (
+                start, start, user.pk, team.pk if team else None, stadium.pk,
+                start, start + timedelta(hours=duration),
+                self.random.random() < 0.6,
+                self.random.choice(Bron.ProviderType.values),
+                stadium.price_hour,
+            )
+
+    def create_brons(self, stadiums, users, teams):
+        total = 0
+        batch = []
+        for stadium in stadiums:
+            daily = defaultdict(lambda: [0, Decimal(0), Decimal(0)])
+            for day, row in self.bron_rows(stadium, users, teams):
+                batch.append(row)
+                start, end, is_paid = row[5], row[6], row[7]
+                totals = daily[day]
+                totals[0] += 1
+                if is_paid:
+                    hours = Decimal((end - start).seconds // 3600)
+                    totals[1] += hours
+                    totals[2] += hours * stadium.price_hour
+                if len(batch) >= self.batch_size:
+                    total += self.write_brons(batch)
+                    batch = []
+                    self.log(f'{total} brons')
+            StadiumDailyStats.objects.bulk_create([
+                StadiumDailyStats(stadium=stadium, date=day, bookings=bookings, paid_hours=hours, income=income)
+                for day, (bookings, hours, income) in daily.items()
+            ], batch_size=self.batch_size)
+        total += self.write_brons(batch)
+        self.log(f'{total} brons')
+        return total
+
+    def write_brons(self, rows):
+        if not rows:
+            return 0
+        with transaction.atomic():
+            if self.use_copy:
+                self.copy(Bron._meta.db_table, BRON_COLUMNS, rows)
+            else:
+                Bron.objects.bulk_create([Bron(**dict(zip(BRON_COLUMNS, row))) for row in rows])
+        return len(rows)
+
+    def copy(self, table, columns, rows):
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+        sql = f'COPY {table} ({", ".join(columns)}) FROM STDIN'
+        with connection.cursor() as cursor:
+            if is_psycopg3:
+                with cursor.cursor.copy(sql) as copy:
+                    for row in rows:
+                        copy.write_row(row)
+            else:
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(rows)
+                buffer.seek(0)
+                cursor.cursor.copy_expert(f'{sql} WITH (FORMAT csv)', buffer)
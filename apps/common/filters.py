@@ -0,0 +1,64 @@
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import Case, Exists, FloatField, OuterRef, Value, When
+from rest_framework.filters import BaseFilterBackend, OrderingFilter, SearchFilter
+
+from . import models, serializers
+
+
+class StadiumAvailabilityFilter(BaseFilterBackend):
+    """
+    Keeps only stadiums with no booking overlapping
+    [available_from, available_to). The NOT EXISTS subquery is answered by
+    the (stadium, start_time, end_time) index behind unique_bron_per_time.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = {
+            key: request.query_params[key]
+            for key in ('available_from', 'available_to')
+            if key in request.query_params
+        }
+        if not params:
+            return queryset
+
+        query = serializers.StadiumAvailabilityQuerySerializer(data=params)
+        query.is_valid(raise_exception=True)
+        booked = models.Bron.objects.filter(
+            stadium=OuterRef('pk'),
+            start_time__lt=query.validated_data['available_to'],
+            end_time__gt=query.validated_data['available_from']
+        )
+        return queryset.filter(~Exists(booked))
+
+
+class StadiumSearchFilter(SearchFilter):
+    """
+    Matches every search term against Stadium.search_document, a lowercased
+    copy of the name, price and manager contact kept up to date on save.
+    On PostgreSQL the match is served by the pg_trgm GIN index and results
+    are ranked by trigram word similarity; elsewhere a plain substring
+    match is ranked by whether the name starts with the query.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = [term.lower() for term in self.get_search_terms(request)]
+        if not terms:
+            return queryset
+
+        for term in terms:
+            queryset = queryset.filter(search_document__contains=term)
+
+        query = ' '.join(terms)
+        if connections[queryset.db].vendor == 'postgresql':
+            rank = TrigramWordSimilarity(query, 'search_document')
+        else:
+            rank = Case(
+                When(name__istartswith=query, then=Value(1.0)),
+                default=Value(0.0),
+                output_field=FloatField()
+            )
+        queryset = queryset.annotate(search_rank=rank)
+        if OrderingFilter.ordering_param in request.query_params:
+            return queryset
+        return queryset.order_by('-search_rank', 'id')
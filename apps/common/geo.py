@@ -0,0 +1,99 @@
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+GEOHASH_PRECISION = 9  # ~5 m cells, stored on Stadium.geohash
+
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        target, value_range = (longitude, lng_range) if even else (latitude, lat_range)
+        middle = (value_range[0] + value_range[1]) / 2
+        value <<= 1
+        if target >= middle:
+            value |= 1
+            value_range[0] = middle
+        else:
+            value_range[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """(height, width) of a geohash cell in degrees."""
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def bounding_box(latitude, longitude, radius_km):
+    lat_delta = radius_km / KM_PER_DEGREE
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    lng_delta = min(radius_km / (KM_PER_DEGREE * cos_lat), 180.0)
+    return (
+        max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0),
+        longitude - lng_delta, longitude + lng_delta,
+    )
+
+
+def covering_cells(latitude, longitude, radius_km):
+    """
+    Geohash prefixes whose union covers the circle: the cell containing the
+    point plus its eight neighbours, at the finest precision where one cell
+    is still larger than the radius. Returns an empty list when the radius
+    is too large for any precision, meaning "no prefix filter".
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+    lat_delta, lng_delta = max_lat - latitude, max_lng - longitude
+    precision = 0
+    for candidate in range(1, GEOHASH_PRECISION + 1):
+        height, width = cell_size(candidate)
+        if height < lat_delta or width < lng_delta:
+            break
+        precision = candidate
+    if not precision:
+        return []
+
+    height, width = cell_size(precision)
+    cells = set()
+    for lat_step in (-height, 0, height):
+        for lng_step in (-width, 0, width):
+            lat = min(max(latitude + lat_step, -90.0), 90.0 - 1e-9)
+            lng = (longitude + lng_step + 180.0) % 360.0 - 180.0
+            cells.add(geohash_encode(lat, lng, precision))
+    return sorted(cells)
+
+
+def prefix_range(prefix):
+    """
+    [low, high) bounds matching every geohash that starts with `prefix`.
+    Plain range predicates use the geohash B-tree on any backend, unlike
+    LIKE 'prefix%'. `high` is None when no upper bound is needed.
+    """
+    head = prefix
+    while head and head[-1] == BASE32[-1]:
+        head = head[:-1]
+    if not head:
+        return prefix, None
+    return prefix, head[:-1] + BASE32[BASE32.index(head[-1]) + 1]
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, map(float, (lat1, lng1, lat2, lng2)))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
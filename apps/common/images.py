@@ -0,0 +1,60 @@
+import io
+import posixpath
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Longest-side bounds of the generated variants; each is stored as WebP and JPEG.
+IMAGE_VARIANTS = {
+    'thumb': 320,
+    'medium': 960,
+}
+IMAGE_FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpeg': {'format': 'JPEG', 'quality': 80, 'optimize': True, 'progressive': True},
+}
+VARIANTS_DIR = 'stadium_image/variants'
+
+
+class InvalidImage(Exception):
+    """The stored file is not an image Pillow can decode."""
+
+
+def variant_name(stadium, variant, extension):
+    stem = posixpath.splitext(posixpath.basename(stadium.image.name))[0]
+    return f'{VARIANTS_DIR}/{stadium.pk}/{stem}_{variant}.{extension}'
+
+
+def decode_image(source):
+    try:
+        return ImageOps.exif_transpose(Image.open(source)).convert('RGB')
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+        # Pillow reports truncated or corrupt data as a plain OSError.
+        raise InvalidImage(str(exc)) from exc
+
+
+def build_image_variants(stadium):
+    """
+    Writes the resized copies of stadium.image to its storage and returns
+    the `image_variants` value describing them.
+    """
+    storage = stadium.image.storage
+    with stadium.image.open('rb') as source:
+        original = decode_image(source)
+
+    variants = {'source': stadium.image.name}
+    for variant, bound in IMAGE_VARIANTS.items():
+        image = original.copy()
+        image.thumbnail((bound, bound), Image.Resampling.LANCZOS)
+        variants[variant] = {}
+        for extension, options in IMAGE_FORMATS.items():
+            buffer = io.BytesIO()
+            image.save(buffer, **options)
+            name = variant_name(stadium, variant, extension)
+            storage.delete(name)
+            variants[variant][extension] = storage.save(name, ContentFile(buffer.getvalue()))
+    return variants
+
+
+def variant_files(variants):
+    return {name for variant in IMAGE_VARIANTS for name in variants.get(variant, {}).values()}
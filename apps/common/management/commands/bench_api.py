@@ -0,0 +1,166 @@
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time as dt_time, timedelta
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import setup_databases, teardown_databases
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.common.caching import invalidate_stadium_list
+from apps.common.datagen import DataGenerator, PASSWORD, OPENING_HOUR
+from apps.common.models import Stadium, Bron
+from apps.user.models import User
+from core.query_budget import QueryCounter
+
+SCENARIOS = ('stadium-list', 'bron-create', 'bron-list', 'stadium-statistic', 'login')
+HOURS_PER_DAY = 14
+# reverse('stadium-list') resolves to the router's StadiumViewSet route.
+STADIUM_LIST_URL = '/api/v1/common/stadium-list/'
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the API through its URL routes against a seeded database and print "
+        "latency percentiles, throughput and SQL queries per request as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stadiums', type=int, default=30)
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--brons-per-stadium', type=int, default=100)
+        parser.add_argument('--requests', type=int, default=200, help="Requests per scenario.")
+        parser.add_argument('--concurrency', type=int, default=8,
+                            help="Parallel clients. SQLite serialises writers, so use PostgreSQL above 1.")
+        parser.add_argument('--scenario', action='append', choices=SCENARIOS, dest='scenarios',
+                            help="Scenario to run; repeat for several. Defaults to all.")
+        parser.add_argument('--in-place', action='store_true',
+                            help="Use the configured database instead of a throwaway test database.")
+        parser.add_argument('--no-seed', action='store_true',
+                            help="Benchmark the data already in the database.")
+        parser.add_argument('--output', help="Write the JSON report to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        old_config = None
+        if not options['in_place']:
+            old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            if not options['no_seed']:
+                DataGenerator(options['stadiums'], options['users'], options['brons_per_stadium'], days_back=30).run()
+            invalidate_stadium_list()
+            fixtures = self.load_fixtures()
+            report = {
+                'config': {
+                    key: options[key]
+                    for key in ('stadiums', 'users', 'brons_per_stadium', 'requests', 'concurrency')
+                },
+                'scenarios': {
+                    scenario: self.run_scenario(scenario, fixtures, options['requests'], options['concurrency'])
+                    for scenario in options['scenarios'] or SCENARIOS
+                },
+            }
+        finally:
+            if old_config is not None:
+                teardown_databases(old_config, verbosity=0)
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def load_fixtures(self):
+        def tokens(queryset):
+            return [(user, str(RefreshToken.for_user(user).access_token)) for user in queryset]
+
+        return {
+            'owners': tokens(User.objects.filter(role='owner', stadium_owner__isnull=False).distinct()[:50]),
+            'users': tokens(User.objects.filter(role='user')[:50]),
+            'stadium_ids': list(Stadium.objects.filter(is_active=True).values_list('id', flat=True)),
+            'first_free_day': self.first_free_day(),
+        }
+
+    def first_free_day(self):
+        # bron-create books hours after every existing booking, and never in the past.
+        latest = Bron.objects.order_by('-end_time').values_list('end_time', flat=True).first()
+        day = timezone.localdate() + timedelta(days=1)
+        if latest is not None:
+            day = max(day, timezone.localdate(latest) + timedelta(days=1))
+        return day
+
+    def run_scenario(self, scenario, fixtures, requests, concurrency):
+        make_request = getattr(self, f"request_{scenario.replace('-', '_')}")
+        local = threading.local()
+
+        def worker(index):
+            if not hasattr(local, 'client'):
+                local.client = Client(raise_request_exception=False)
+            with QueryCounter() as counter:
+                started = time.perf_counter()
+                response = make_request(local.client, fixtures, index)
+                elapsed = time.perf_counter() - started
+            return elapsed, len(counter), response.status_code
+
+        started = time.perf_counter()
+        if concurrency > 1:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                samples = list(pool.map(worker, range(requests)))
+        else:
+            samples = [worker(index) for index in range(requests)]
+        wall_time = time.perf_counter() - started
+
+        latencies = [elapsed * 1000 for elapsed, _, _ in samples]
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+        return {
+            'requests': requests,
+            'errors': sum(status >= 400 for _, _, status in samples),
+            'p50_ms': round(cuts[49], 2),
+            'p95_ms': round(cuts[94], 2),
+            'p99_ms': round(cuts[98], 2),
+            'throughput_rps': round(requests / wall_time, 2),
+            'queries_per_request': round(statistics.mean(queries for _, queries, _ in samples), 2),
+        }
+
+    @staticmethod
+    def auth(token):
+        return {'Authorization': f'Bearer {token}'}
+
+    def request_stadium_list(self, client, fixtures, index):
+        _, token = fixtures['users'][index % len(fixtures['users'])]
+        offset = index * 10 % max(len(fixtures['stadium_ids']), 1)
+        return client.get(STADIUM_LIST_URL, {'offset': offset}, headers=self.auth(token))
+
+    def request_bron_create(self, client, fixtures, index):
+        _, token = fixtures['users'][index % len(fixtures['users'])]
+        stadium_ids = fixtures['stadium_ids']
+        # Every request books its own hour, so a rejection is a real error.
+        slot = index // len(stadium_ids)
+        day = fixtures['first_free_day'] + timedelta(days=slot // HOURS_PER_DAY)
+        start = timezone.make_aware(datetime.combine(day, dt_time(OPENING_HOUR + slot % HOURS_PER_DAY)))
+        return client.post(reverse('bron-create'), {
+            'stadium': stadium_ids[index % len(stadium_ids)],
+            'start_time': start.isoformat(),
+            'end_time': (start + timedelta(hours=1)).isoformat(),
+            'is_team': False,
+        }, content_type='application/json', headers=self.auth(token))
+
+    def request_bron_list(self, client, fixtures, index):
+        _, token = fixtures['owners'][index % len(fixtures['owners'])]
+        return client.get(reverse('owner-bron-list'), {'offset': index % 5 * 10}, headers=self.auth(token))
+
+    def request_stadium_statistic(self, client, fixtures, index):
+        _, token = fixtures['owners'][index % len(fixtures['owners'])]
+        return client.get(reverse('owner-stadium-statistic'), headers=self.auth(token))
+
+    def request_login(self, client, fixtures, index):
+        user, _ = fixtures['users'][index % len(fixtures['users'])]
+        return client.post(reverse('login'), {
+            'phone_number': user.phone_number,
+            'password': PASSWORD,
+        }, content_type='application/json')
@@ -0,0 +1,111 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import setup_databases, teardown_databases
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.common.caching import invalidate_stadium_list
+from apps.common.datagen import DataGenerator
+from apps.user.models import User
+from core.compression import COMPRESSORS, ENCODINGS
+from core.renderers import FastJSONRenderer, orjson
+from .bench_api import STADIUM_LIST_URL
+
+ENDPOINTS = ('stadium-list', 'bron-list')
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark JSON rendering and response compression for stadium-list/ and bron-list/ "
+        "pages against a seeded database and print render times and bytes on the wire as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stadiums', type=int, default=30)
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--brons-per-stadium', type=int, default=100)
+        parser.add_argument('--limit', type=int, default=100, help="Rows per benchmarked page.")
+        parser.add_argument('--repeat', type=int, default=50, help="Renders timed per renderer.")
+        parser.add_argument('--in-place', action='store_true',
+                            help="Use the configured database instead of a throwaway test database.")
+        parser.add_argument('--no-seed', action='store_true',
+                            help="Benchmark the data already in the database.")
+        parser.add_argument('--output', help="Write the JSON report to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        old_config = None
+        if not options['in_place']:
+            old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            if not options['no_seed']:
+                DataGenerator(options['stadiums'], options['users'], options['brons_per_stadium'], days_back=30).run()
+            invalidate_stadium_list()
+            report = {
+                'config': {key: options[key] for key in ('stadiums', 'users', 'brons_per_stadium', 'limit', 'repeat')},
+                'orjson': orjson is not None,
+                'endpoints': {
+                    endpoint: self.run_endpoint(endpoint, options['limit'], options['repeat'])
+                    for endpoint in ENDPOINTS
+                },
+            }
+        finally:
+            if old_config is not None:
+                teardown_databases(old_config, verbosity=0)
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def run_endpoint(self, endpoint, limit, repeat):
+        if endpoint == 'stadium-list':
+            user, url = User.objects.filter(role='user').first(), STADIUM_LIST_URL
+        else:
+            user, url = User.objects.filter(stadium_owner__isnull=False).first(), reverse('owner-bron-list')
+        headers = {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+        client = Client()
+
+        def get(accept_encoding):
+            response = client.get(url, {'limit': limit}, headers={**headers, 'Accept-Encoding': accept_encoding})
+            if response.status_code != 200:
+                raise RuntimeError(f"{url} answered {response.status_code}")
+            return response
+
+        data = get('identity').data
+        render_ms = {
+            name: self.time_ms(lambda: renderer.render(data), repeat)
+            for name, renderer in (('drf', JSONRenderer()), ('fast', FastJSONRenderer()))
+        }
+        body = JSONRenderer().render(data)
+        return {
+            'rows': len(data['results']),
+            'render_ms': render_ms,
+            'render_speedup': round(render_ms['drf'] / render_ms['fast'], 2) if render_ms['fast'] else None,
+            'bytes': {
+                'identity': len(body),
+                **{
+                    encoding: len(get(encoding).content) if encoding in COMPRESSORS else None
+                    for encoding in ENCODINGS
+                },
+            },
+            'compress_ms': {
+                encoding: self.time_ms(lambda: COMPRESSORS[encoding](body), repeat) if encoding in COMPRESSORS else None
+                for encoding in ENCODINGS
+            },
+        }
+
+    @staticmethod
+    def time_ms(func, repeat):
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - started)
+        return round(statistics.median(samples) * 1000, 3)
@@ -0,0 +1,45 @@
+import math
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.common.datagen import DataGenerator, PASSWORD
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic users, teams, stadiums and non-overlapping bookings at production scale."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--brons', type=int, default=1_000_000, help="Total bookings to generate.")
+        parser.add_argument('--stadiums', type=int, default=2000)
+        parser.add_argument('--users', type=int, default=50_000)
+        parser.add_argument('--days-back', type=int, default=365,
+                            help="Bookings start this many days before today.")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--copy', action='store_true', help="Load bookings with COPY (PostgreSQL only).")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed, for reproducible data sets.")
+
+    def handle(self, *args, **options):
+        if options['stadiums'] < 1:
+            raise CommandError("--stadiums must be at least 1.")
+        if options['copy'] and connection.vendor != 'postgresql':
+            raise CommandError("--copy needs a PostgreSQL database.")
+
+        started = time.monotonic()
+        generator = DataGenerator(
+            stadiums=options['stadiums'],
+            users=options['users'],
+            brons_per_stadium=math.ceil(options['brons'] / options['stadiums']),
+            days_back=options['days_back'],
+            batch_size=options['batch_size'],
+            use_copy=options['copy'],
+            seed=options['seed'],
+            log=lambda message: self.stdout.write(f"  {message}") if options['verbosity'] > 1 else None,
+        )
+        created = generator.run()
+
+        self.stdout.write(self.style.SUCCESS(
+            ", ".join(f"{count} {name}" for name, count in created.items())
+            + f" created in {time.monotonic() - started:.1f}s. Password for every user: {PASSWORD}"
+        ))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.common.models import StadiumCounter
+
+
+class Command(BaseCommand):
+    help = "Recompute the stadium total/active/inactive counters from the Stadium table."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            before = StadiumCounter.objects.select_for_update().filter(pk=StadiumCounter.SINGLETON_ID).first()
+            after = StadiumCounter.recompute()
+
+        if before is None:
+            self.stdout.write(self.style.WARNING("Counter row was missing and has been created."))
+        elif (before.total, before.active, before.inactive) != (after.total, after.active, after.inactive):
+            self.stdout.write(self.style.WARNING(
+                f"Fixed drift: total {before.total} -> {after.total}, "
+                f"active {before.active} -> {after.active}, "
+                f"inactive {before.inactive} -> {after.inactive}."
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f"Stadiums: {after.total} total, {after.active} active, {after.inactive} inactive."
+        ))
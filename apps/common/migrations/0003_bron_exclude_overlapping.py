@@ -0,0 +1,31 @@
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations
+
+CONSTRAINT_NAME = "exclude_overlapping_bron"
+
+
+def add_exclusion_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"ALTER TABLE common_bron ADD CONSTRAINT {CONSTRAINT_NAME} "
+        "EXCLUDE USING gist (stadium_id WITH =, tstzrange(start_time, end_time) WITH &&)"
+    )
+
+
+def remove_exclusion_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"ALTER TABLE common_bron DROP CONSTRAINT IF EXISTS {CONSTRAINT_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0002_initial"),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.RunPython(add_exclusion_constraint, remove_exclusion_constraint),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:31
+
+from django.db import migrations, models
+
+from apps.common.geo import geohash_encode
+
+
+def fill_geohash(apps, schema_editor):
+    Stadium = apps.get_model("common", "Stadium")
+    stadiums = list(Stadium.objects.only("latitude", "longitude"))
+    for stadium in stadiums:
+        stadium.geohash = geohash_encode(stadium.latitude, stadium.longitude)
+    Stadium.objects.bulk_update(stadiums, ["geohash"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0003_bron_exclude_overlapping"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stadium",
+            name="geohash",
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12),
+        ),
+        migrations.RunPython(fill_geohash, migrations.RunPython.noop),
+    ]
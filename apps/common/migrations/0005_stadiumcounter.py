@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:35
+
+from django.db import migrations, models
+
+
+def seed_counter(apps, schema_editor):
+    Stadium = apps.get_model("common", "Stadium")
+    StadiumCounter = apps.get_model("common", "StadiumCounter")
+    total = Stadium.objects.count()
+    active = Stadium.objects.filter(is_active=True).count()
+    StadiumCounter.objects.create(pk=1, total=total, active=active, inactive=total - active)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0004_stadium_geohash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StadiumCounter",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("total", models.IntegerField(default=0)),
+                ("active", models.IntegerField(default=0)),
+                ("inactive", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Stadium counter",
+                "verbose_name_plural": "Stadium counters",
+            },
+        ),
+        migrations.RunPython(seed_counter, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:37
+
+from collections import defaultdict
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_daily_stats(apps, schema_editor):
+    Bron = apps.get_model("common", "Bron")
+    StadiumDailyStats = apps.get_model("common", "StadiumDailyStats")
+    totals = defaultdict(lambda: [0, Decimal(0), Decimal(0)])
+    rows = Bron.objects.values_list("stadium_id", "start_time", "end_time", "is_paid", "stadium__price_hour")
+    for stadium_id, start_time, end_time, is_paid, price_hour in rows.iterator():
+        row = totals[stadium_id, timezone.localdate(start_time)]
+        row[0] += 1
+        if is_paid:
+            hours = (Decimal((end_time - start_time).total_seconds()) / 3600).quantize(Decimal("0.01"))
+            row[1] += hours
+            row[2] += hours * price_hour
+    StadiumDailyStats.objects.bulk_create(
+        [
+            StadiumDailyStats(stadium_id=stadium_id, date=day, bookings=bookings, paid_hours=hours, income=income)
+            for (stadium_id, day), (bookings, hours, income) in totals.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0005_stadiumcounter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StadiumDailyStats",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                ("bookings", models.IntegerField(default=0)),
+                ("paid_hours", models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ("income", models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                (
+                    "stadium",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to="common.stadium",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Stadium daily stats",
+                "verbose_name_plural": "Stadium daily stats",
+                "constraints": [
+                    models.UniqueConstraint(fields=("stadium", "date"), name="unique_stadium_daily_stats")
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
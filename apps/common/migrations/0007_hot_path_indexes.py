@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0006_stadiumdailystats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bron',
+            index=models.Index(fields=['stadium', 'is_paid'], name='bron_stadium_paid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bron',
+            index=models.Index(fields=['start_time', 'id'], name='bron_start_time_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stadium',
+            index=models.Index(fields=['owner', 'is_active'], name='stadium_owner_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stadium',
+            index=models.Index(fields=['name'], condition=models.Q(is_active=True), name='stadium_active_name_idx'),
+        ),
+    ]
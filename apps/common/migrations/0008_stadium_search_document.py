@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:05
+
+from decimal import Decimal
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+INDEX_NAME = "stadium_search_trgm_idx"
+
+
+def fill_search_document(apps, schema_editor):
+    Stadium = apps.get_model("common", "Stadium")
+    stadiums = list(Stadium.objects.select_related("manager"))
+    for stadium in stadiums:
+        parts = [stadium.name, f"{Decimal(stadium.price_hour):.2f}"]
+        if stadium.manager is not None:
+            parts += [stadium.manager.full_name, stadium.manager.phone_number]
+        stadium.search_document = " ".join(part for part in parts if part).lower()
+    Stadium.objects.bulk_update(stadiums, ["search_document"], batch_size=500)
+
+
+def add_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX {INDEX_NAME} ON common_stadium USING gin (search_document gin_trgm_ops)"
+    )
+
+
+def remove_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0007_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stadium",
+            name="search_document",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(fill_search_document, migrations.RunPython.noop),
+        TrigramExtension(),
+        migrations.RunPython(add_trigram_index, remove_trigram_index),
+    ]
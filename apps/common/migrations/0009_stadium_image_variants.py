@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0008_stadium_search_document"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stadium",
+            name="image_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
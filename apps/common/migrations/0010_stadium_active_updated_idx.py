@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0009_stadium_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stadium',
+            index=models.Index(fields=['is_active', 'updated_at'], name='stadium_active_updated_idx'),
+        ),
+    ]
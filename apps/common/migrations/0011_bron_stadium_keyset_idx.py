@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0010_stadium_active_updated_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='bron',
+            name='bron_start_time_id_idx',
+        ),
+        migrations.AddIndex(
+            model_name='bron',
+            index=models.Index(fields=['stadium', 'start_time', 'id'], name='bron_stadium_start_id_idx'),
+        ),
+    ]
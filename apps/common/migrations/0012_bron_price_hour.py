@@ -0,0 +1,31 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_price_hour(apps, schema_editor):
+    # The price at booking time was never recorded; the current one is the
+    # amount existing rollups were computed with.
+    Bron = apps.get_model('common', 'Bron')
+    Stadium = apps.get_model('common', 'Stadium')
+    Bron.objects.update(price_hour=Subquery(Stadium.objects.filter(pk=OuterRef('stadium_id')).values('price_hour')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0011_bron_stadium_keyset_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bron',
+            name='price_hour',
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.RunPython(fill_price_hour, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='bron',
+            name='price_hour',
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=10),
+        ),
+    ]
@@ -1,7 +1,15 @@
+from asgiref.sync import sync_to_async
 from django.db import models
 from apps.user.models import User
 from django.utils.translation import gettext_lazy as _
 from django.db.models import Sum, Count
+from decimal import Decimal
+from core.tracking import LoadedValuesMixin
+from .geo import geohash_encode
+
+# Stadium fields that feed Stadium.search_document, next to the manager's
+# full_name and phone_number.
+SEARCH_DOCUMENT_FIELDS = ('name', 'price_hour', 'manager')
 
 
 class BaseModel(models.Model):
@@ -22,7 +30,7 @@ class Team(BaseModel):
         return self.name
 
 
-class Stadium(BaseModel):
+class Stadium(LoadedValuesMixin, BaseModel):
     name = models.CharField(max_length=225)
     image = models.ImageField(upload_to='stadium_image/', null=True, blank=True)
     latitude = models.DecimalField(max_digits=9, decimal_places=6)
@@ -33,12 +41,100 @@ class Stadium(BaseModel):
     manager = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True,
                                 related_name="stadium_manager")
     is_active = models.BooleanField(default=True)
+    geohash = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
+    search_document = models.TextField(blank=True, editable=False)
+    # Resized copies of `image`, filled in by tasks.generate_stadium_image_variants.
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['owner', 'is_active'], name='stadium_owner_active_idx'),
+            models.Index(fields=['name'], condition=models.Q(is_active=True), name='stadium_active_name_idx'),
+            # Covers the MAX(updated_at)/COUNT validators of the stadium list.
+            models.Index(fields=['is_active', 'updated_at'], name='stadium_active_updated_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.geohash = geohash_encode(self.latitude, self.longitude)
+        update_fields = kwargs.get('update_fields')
+        self.search_document = self.build_search_document()
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if {'latitude', 'longitude'} & update_fields:
+                update_fields.add('geohash')
+            if set(SEARCH_DOCUMENT_FIELDS) & update_fields:
+                update_fields.add('search_document')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+
+    def build_search_document(self):
+        parts = [self.name, f'{Decimal(self.price_hour):.2f}']
+        if self.manager_id is not None:
+            parts += [self.manager.full_name, self.manager.phone_number]
+        return ' '.join(part for part in parts if part).lower()
 
     def __str__(self):
         return self.name
 
 
-class Bron(BaseModel):
+class StadiumCounter(models.Model):
+    """Single-row running totals behind the admin stadium statistics."""
+    total = models.IntegerField(default=0)
+    active = models.IntegerField(default=0)
+    inactive = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = models.Manager()
+
+    SINGLETON_ID = 1
+
+    class Meta:
+        verbose_name = "Stadium counter"
+        verbose_name_plural = "Stadium counters"
+
+    @classmethod
+    def get(cls):
+        try:
+            return cls.objects.get(pk=cls.SINGLETON_ID)
+        except cls.DoesNotExist:
+            return cls.recompute()
+
+    @classmethod
+    async def aget(cls):
+        try:
+            return await cls.objects.aget(pk=cls.SINGLETON_ID)
+        except cls.DoesNotExist:
+            return await sync_to_async(cls.recompute)()
+
+    @classmethod
+    def recompute(cls):
+        stats = Stadium.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=models.Q(is_active=True)),
+        )
+        counter, _ = cls.objects.update_or_create(
+            pk=cls.SINGLETON_ID,
+            defaults={
+                'total': stats['total'],
+                'active': stats['active'],
+                'inactive': stats['total'] - stats['active'],
+            }
+        )
+        return counter
+
+    @classmethod
+    def shift(cls, total=0, active=0, inactive=0):
+        cls.objects.filter(pk=cls.SINGLETON_ID).update(
+            total=models.F('total') + total,
+            active=models.F('active') + active,
+            inactive=models.F('inactive') + inactive,
+        )
+
+    def __str__(self):
+        return f"{self.active}/{self.total} active"
+
+
+class Bron(LoadedValuesMixin, BaseModel):
     class ProviderType(models.TextChoices):
         CLICK = 'click', _('Click')
         PAYME = 'payme', _('Payme')
@@ -54,6 +150,8 @@ class Bron(BaseModel):
         max_length=25,
         choices=ProviderType.choices, default=ProviderType.CASH
     )
+    # The stadium's price when booked; income rollups use it both ways.
+    price_hour = models.DecimalField(max_digits=10, decimal_places=2, editable=False)
 
     class Meta:
         verbose_name = "Bron"
@@ -64,7 +162,39 @@ class Bron(BaseModel):
                 name='unique_bron_per_time'
             )
         ]
+        # (stadium, start_time, end_time) overlap lookups are served by the
+        # index behind unique_bron_per_time. Owner and manager lists filter on
+        # their stadiums and page by (start_time, id), hence the keyset index.
+        indexes = [
+            models.Index(fields=['stadium', 'is_paid'], name='bron_stadium_paid_idx'),
+            models.Index(fields=['stadium', 'start_time', 'id'], name='bron_stadium_start_id_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.price_hour is None:
+            self.price_hour = self.stadium.price_hour
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.stadium.name} | {self.start_time}-{self.end_time}"
 
+
+class StadiumDailyStats(models.Model):
+    """Per-stadium, per-local-day booking rollup behind the owner statistics."""
+    stadium = models.ForeignKey(Stadium, on_delete=models.CASCADE, related_name="daily_stats")
+    date = models.DateField()
+    bookings = models.IntegerField(default=0)
+    paid_hours = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    income = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    objects = models.Manager()
+
+    class Meta:
+        verbose_name = "Stadium daily stats"
+        verbose_name_plural = "Stadium daily stats"
+        constraints = [
+            models.UniqueConstraint(fields=['stadium', 'date'], name='unique_stadium_daily_stats')
+        ]
+
+    def __str__(self):
+        return f"{self.stadium_id} | {self.date}"
@@ -0,0 +1,147 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, LimitOffsetPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class BronKeysetPagination(BasePagination):
+    """
+    Forward-only keyset pagination over (start_time, id).
+
+    Each page is a single indexed range scan that continues after the last
+    row of the previous page, so page N costs the same as page 1 and no
+    COUNT(*) is issued. Only `start_time` / `-start_time` ordering is
+    compatible with the key.
+    """
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'limit'
+    ordering_query_param = 'ordering'
+    invalid_cursor_message = _('Invalid cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return self.set_page([obj async for obj in self.get_page_queryset(queryset, request)])
+
+    def get_page_queryset(self, queryset, request):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.descending = self.get_descending(request)
+
+        fields = ('-start_time', '-id') if self.descending else ('start_time', 'id')
+        queryset = queryset.order_by(*fields)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            start_time, pk = position
+            lookup = 'lt' if self.descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'start_time__{lookup}': start_time}) | Q(start_time=start_time, **{f'id__{lookup}': pk})
+            )
+
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_descending(self, request):
+        ordering = request.query_params.get(self.ordering_query_param, 'start_time')
+        if ordering not in ('start_time', '-start_time'):
+            raise ValidationError({
+                self.ordering_query_param: _("Cursor pagination only supports ordering by start_time.")
+            })
+        return ordering == '-start_time'
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(last))
+
+    def encode_cursor(self, instance):
+        token = json.dumps([instance.start_time.isoformat(), instance.pk, int(self.descending)])
+        return urlsafe_b64encode(token.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            token = urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)).decode()
+            start_time, pk, descending = json.loads(token)
+            start_time = datetime.fromisoformat(start_time)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if bool(descending) != self.descending or start_time.tzinfo is None:
+            raise NotFound(self.invalid_cursor_message)
+        return start_time, pk
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'results': schema,
+            },
+        }
+
+
+class AsyncLimitOffsetPagination(LimitOffsetPagination):
+    """LimitOffsetPagination with an awaitable paginate_queryset for async views."""
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.count = await queryset.acount()
+        self.offset = self.get_offset(request)
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+
+        if self.count == 0 or self.offset > self.count:
+            return []
+        return [obj async for obj in queryset[self.offset:self.offset + self.limit]]
+
+
+def is_keyset_request(request):
+    return (
+        BronKeysetPagination.cursor_query_param in request.query_params
+        or request.query_params.get('pagination') == 'cursor'
+    )
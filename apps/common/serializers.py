@@ -1,10 +1,39 @@
-from django.db.models import Sum
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Sum, Q
 from rest_framework import serializers
 from . import models
 from apps.user.models import User
 from datetime import timedelta
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from .images import IMAGE_VARIANTS
+from .signals import brons_bulk_created
+from .slots import slot_index
+from .uploads import INVALID_FORMAT, SIGNATURE_LENGTH, image_format
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """URLs of the resized copies of a stadium's image, empty until they are generated."""
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        super().__init__(**kwargs)
+
+    def to_representation(self, stadium):
+        variants = stadium.image_variants
+        if not stadium.image or variants.get('source') != stadium.image.name:
+            return {}
+        request = self.context.get('request')
+        storage = stadium.image.storage
+        return {
+            variant: {
+                extension: request.build_absolute_uri(storage.url(name)) if request else storage.url(name)
+                for extension, name in variants[variant].items()
+            }
+            for variant in IMAGE_VARIANTS if variant in variants
+        }
+
 
 class BaseStadiumCreateSerializer(serializers.ModelSerializer):
     manager = serializers.PrimaryKeyRelatedField(queryset=models.User.objects.exclude(role='admin'), required=False)
@@ -12,18 +41,37 @@ class BaseStadiumCreateSerializer(serializers.ModelSerializer):
     latitude = serializers.DecimalField(max_digits=9, decimal_places=6, required=True)
     longitude = serializers.DecimalField(max_digits=9, decimal_places=6, required=True)
     price_hour = serializers.DecimalField(max_digits=10, decimal_places=2, required=True)
+    # A plain FileField: decoding the image is left to the variants task after commit.
+    image = serializers.FileField(required=False, allow_null=True)
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = models.Stadium
         fields = [
             'id', 'name', 'latitude', 'longitude', 'description',
-            'price_hour', 'owner', 'manager', 'is_active'
+            'price_hour', 'owner', 'manager', 'is_active', 'image', 'image_variants'
         ]
         extra_kwargs = {
             'owner': {'required': False},
         }
 
+    def validate_image(self, image):
+        if image is None:
+            return image
+        if image.size > settings.STADIUM_IMAGE_MAX_SIZE:
+            raise serializers.ValidationError(_("The image is too large."))
+        header = image.read(SIGNATURE_LENGTH)
+        image.seek(0)
+        if image_format(header) is None:
+            raise serializers.ValidationError(INVALID_FORMAT)
+        return image
+
     def validate(self, attrs):
+        # Files rejected by ImageUploadHandler never reach the serializer.
+        upload_errors = getattr(self.context['request'], 'upload_errors', {})
+        if 'image' in upload_errors:
+            raise serializers.ValidationError({"image": [upload_errors['image']]})
+
         name = attrs.get('name')
         latitude = attrs.get('latitude')
         longitude = attrs.get('longitude')
@@ -55,7 +103,7 @@ class StadiumOwnerCreateSerializer(BaseStadiumCreateSerializer):
         model = models.Stadium
         fields = [
             'id', 'name', 'latitude', 'longitude', 'description',
-            'price_hour', 'manager', 'is_active'
+            'price_hour', 'manager', 'is_active', 'image', 'image_variants'
         ]
 
     def create(self, validated_data):
@@ -83,14 +131,55 @@ class UserShortInfoSerializer(serializers.ModelSerializer):
 
 class StadiumListSerializer(serializers.ModelSerializer):
     manager = UserShortInfoSerializer()
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = models.Stadium
         fields = [
             'id', 'name', 'latitude', 'longitude', 'description',
-            'price_hour', 'manager', 'is_active', 'image'
+            'price_hour', 'manager', 'is_active', 'image', 'image_variants'
         ]
 
+class StadiumNearbySerializer(StadiumListSerializer):
+    distance_km = serializers.FloatField(read_only=True)
+
+    class Meta(StadiumListSerializer.Meta):
+        fields = StadiumListSerializer.Meta.fields + ['distance_km']
+
+
+class StadiumNearbyQuerySerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lng = serializers.FloatField(min_value=-180, max_value=180)
+    radius = serializers.FloatField(min_value=0.01, max_value=settings.STADIUM_NEARBY_MAX_RADIUS_KM, default=5)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+def validate_bron_time(start_time, end_time):
+    now = timezone.now()
+
+    if any([start_time < now, end_time < now, start_time >= end_time]):
+        raise serializers.ValidationError({
+            "message": _("The time was entered incorrectly.")
+        })
+
+    duration = (end_time - start_time).total_seconds() / 3600
+    if duration < 1 or duration % 1 != 0:
+        raise serializers.ValidationError(_("The booking time was not available."))
+
+
+def validate_bron_booker(user, is_team, team):
+    if user.role in ['admin', 'manager']:
+        raise serializers.ValidationError(_("Admins and Managers cannot book stadiums."))
+
+    if is_team:
+        if not team:
+            raise serializers.ValidationError({"team": _("Team must be provided for team bookings.")})
+        if team.owner != user and user not in team.members.all():
+            raise serializers.ValidationError(_("You are not allowed to book on behalf of this team."))
+    elif team:
+        raise serializers.ValidationError({"team": _("Team should not be provided for user bookings.")})
+
+
 class BronCreateSerializer(serializers.ModelSerializer):
     is_team = serializers.BooleanField(write_only=True)
     team = serializers.PrimaryKeyRelatedField(
@@ -111,34 +200,16 @@ class BronCreateSerializer(serializers.ModelSerializer):
         is_team = attrs.get('is_team')
         team = attrs.get('team')
 
-        now = timezone.now()
-
-        if any([start_time < now, end_time < now, start_time >= end_time]):
-            raise serializers.ValidationError({
-                "message": _("The time was entered incorrectly.")
-            })
-
-        duration = (end_time - start_time).total_seconds() / 3600
-        if duration < 1 or duration % 1 != 0:
-            raise serializers.ValidationError(_("The booking time was not available."))
+        validate_bron_time(start_time, end_time)
 
-        if models.Bron.objects.filter(
+        if slot_index.is_booked(stadium.id, start_time, end_time) or models.Bron.objects.filter(
                 stadium=stadium,
                 start_time__lt=end_time,
                 end_time__gt=start_time
         ).exists():
             raise serializers.ValidationError(_("This time slot is already booked."))
 
-        if user.role in ['admin', 'manager']:
-            raise serializers.ValidationError(_("Admins and Managers cannot book stadiums."))
-
-        if is_team:
-            if not team:
-                raise serializers.ValidationError({"team": _("Team must be provided for team bookings.")})
-            if team.owner != user and user not in team.members.all():
-                raise serializers.ValidationError(_("You are not allowed to book on behalf of this team."))
-        elif team:
-            raise serializers.ValidationError({"team": _("Team should not be provided for user bookings.")})
+        validate_bron_booker(user, is_team, team)
 
         return attrs
 
@@ -147,7 +218,123 @@ class BronCreateSerializer(serializers.ModelSerializer):
         validated_data['user'] = user
         validated_data.pop('is_team')  # Not needed for DB
 
-        return super().create(validated_data)
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            # A concurrent request won the race; the exclusion constraint on
+            # (stadium, start_time..end_time) rejected this one.
+            if models.Bron.objects.filter(
+                    stadium=validated_data['stadium'],
+                    start_time__lt=validated_data['end_time'],
+                    end_time__gt=validated_data['start_time']
+            ).exists():
+                raise serializers.ValidationError(_("This time slot is already booked."))
+            raise
+
+class BronSlotSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.Bron
+        fields = ['id', 'start_time', 'end_time']
+        read_only_fields = ['id']
+
+
+class BronRecurrenceSerializer(serializers.Serializer):
+    start_time = serializers.DateTimeField()
+    end_time = serializers.DateTimeField()
+    count = serializers.IntegerField(min_value=1, max_value=settings.BRON_BULK_MAX_SLOTS)
+    interval_weeks = serializers.IntegerField(min_value=1, default=1)
+
+    def to_slots(self, attrs):
+        step = timedelta(weeks=attrs['interval_weeks'])
+        return [
+            {'start_time': attrs['start_time'] + step * i, 'end_time': attrs['end_time'] + step * i}
+            for i in range(attrs['count'])
+        ]
+
+
+class BronBulkCreateSerializer(serializers.Serializer):
+    stadium = serializers.PrimaryKeyRelatedField(queryset=models.Stadium.objects.all())
+    order_type = serializers.ChoiceField(choices=models.Bron.ProviderType.choices, default=models.Bron.ProviderType.CASH)
+    is_team = serializers.BooleanField(write_only=True)
+    team = serializers.PrimaryKeyRelatedField(
+        queryset=models.Team.objects.all(),
+        required=False,
+        allow_null=True
+    )
+    slots = BronSlotSerializer(many=True, required=False)
+    recurrence = BronRecurrenceSerializer(required=False, write_only=True)
+
+    def validate(self, attrs):
+        user = self.context['request'].user
+        stadium = attrs['stadium']
+        slots = attrs.get('slots')
+        recurrence = attrs.pop('recurrence', None)
+
+        if bool(slots) == bool(recurrence):
+            raise serializers.ValidationError({"message": _("Provide either 'slots' or 'recurrence'.")})
+        if recurrence:
+            slots = BronRecurrenceSerializer().to_slots(recurrence)
+        if len(slots) > settings.BRON_BULK_MAX_SLOTS:
+            raise serializers.ValidationError({
+                "message": _("At most %(count)s slots can be booked at once.") % {"count": settings.BRON_BULK_MAX_SLOTS}
+            })
+
+        slots = sorted(slots, key=lambda slot: slot['start_time'])
+        for slot in slots:
+            validate_bron_time(slot['start_time'], slot['end_time'])
+        for previous, slot in zip(slots, slots[1:]):
+            if slot['start_time'] < previous['end_time']:
+                raise serializers.ValidationError(_("The requested slots overlap each other."))
+
+        overlap = Q()
+        for slot in slots:
+            overlap |= Q(start_time__lt=slot['end_time'], end_time__gt=slot['start_time'])
+        booked = list(
+            models.Bron.objects.filter(overlap, stadium=stadium)
+            .order_by('start_time').values_list('start_time', 'end_time')
+        )
+        if booked:
+            raise serializers.ValidationError({
+                "message": _("This time slot is already booked."),
+                "booked": [
+                    {"start_time": start.isoformat(), "end_time": end.isoformat()} for start, end in booked
+                ]
+            })
+
+        validate_bron_booker(user, attrs.get('is_team'), attrs.get('team'))
+
+        attrs['slots'] = slots
+        return attrs
+
+    def create(self, validated_data):
+        user = self.context['request'].user
+        brons = [
+            models.Bron(
+                user=user,
+                team=validated_data.get('team'),
+                stadium=validated_data['stadium'],
+                price_hour=validated_data['stadium'].price_hour,
+                order_type=validated_data['order_type'],
+                start_time=slot['start_time'],
+                end_time=slot['end_time'],
+            )
+            for slot in validated_data['slots']
+        ]
+        try:
+            with transaction.atomic():
+                brons = models.Bron.objects.bulk_create(brons)
+        except IntegrityError:
+            raise serializers.ValidationError(_("This time slot is already booked."))
+        brons_bulk_created(brons)
+        return brons
+
+    def to_representation(self, instance):
+        return {
+            "stadium": instance[0].stadium_id,
+            "slots": BronSlotSerializer(instance, many=True).data,
+        }
+
 
 class BronUpdateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -168,8 +355,49 @@ class StadionBronSerializer(serializers.ModelSerializer):
 
 class StadiumStatsSerializer(serializers.ModelSerializer):
     total_bron_count = serializers.IntegerField()
-    total_income = serializers.DecimalField(max_digits=10, decimal_places=2)
+    paid_hours = serializers.DecimalField(max_digits=10, decimal_places=2)
+    total_income = serializers.DecimalField(max_digits=14, decimal_places=2)
 
     class Meta:
         model = models.Stadium
-        fields = ['id', 'name', 'price_hour', 'total_bron_count', 'total_income']
\ No newline at end of file
+        fields = ['id', 'name', 'price_hour', 'total_bron_count', 'paid_hours', 'total_income']
+
+
+class StadiumStatsQuerySerializer(serializers.Serializer):
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if 'date_from' in attrs and 'date_to' in attrs and attrs['date_to'] < attrs['date_from']:
+            raise serializers.ValidationError({"message": _("'to' must not be earlier than 'from'.")})
+        return attrs
+
+
+class FreeSlotsQuerySerializer(serializers.Serializer):
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        today = timezone.localdate()
+        date_from = attrs.setdefault('date_from', today)
+        date_to = attrs.setdefault('date_to', date_from)
+
+        if date_from < today:
+            raise serializers.ValidationError({"message": _("'from' must not be in the past.")})
+        if date_to < date_from:
+            raise serializers.ValidationError({"message": _("'to' must not be earlier than 'from'.")})
+        if (date_to - date_from).days >= settings.FREE_SLOTS_MAX_DAYS:
+            raise serializers.ValidationError({
+                "message": _("The date range cannot exceed %(days)s days.") % {"days": settings.FREE_SLOTS_MAX_DAYS}
+            })
+        return attrs
+
+
+class StadiumAvailabilityQuerySerializer(serializers.Serializer):
+    available_from = serializers.DateTimeField()
+    available_to = serializers.DateTimeField()
+
+    def validate(self, attrs):
+        if attrs['available_from'] >= attrs['available_to']:
+            raise serializers.ValidationError({"message": _("'available_from' must be earlier than 'available_to'.")})
+        return attrs
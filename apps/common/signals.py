@@ -0,0 +1,151 @@
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from apps.user.models import User
+from apps.user.signals import bump_token_versions
+from . import models, stats, tasks
+from .caching import invalidate_free_slots, invalidate_stadium_availability, invalidate_stadium_list
+from .slots import slot_index
+
+logger = logging.getLogger(__name__)
+
+# User fields embedded in stadium list responses via UserShortInfoSerializer
+# and in Stadium.search_document.
+MANAGER_LIST_FIELDS = ('full_name', 'phone_number')
+STADIUM_STAFF_FIELDS = ('owner_id', 'manager_id')
+
+
+def _bron_changed(stadium_id):
+    slot_index.discard(stadium_id)
+    invalidate_free_slots(stadium_id)
+    invalidate_stadium_availability()
+
+
+def _stadium_list_changed():
+    # Invalidate now so this transaction's own reads are fresh, and again on
+    # commit so a page cached by a concurrent reader in between is dropped.
+    invalidate_stadium_list()
+    transaction.on_commit(invalidate_stadium_list)
+
+
+def _refresh_search_documents(stadiums):
+    stadiums = list(stadiums.select_related('manager'))
+    for stadium in stadiums:
+        stadium.search_document = stadium.build_search_document()
+    models.Stadium.objects.bulk_update(stadiums, ['search_document'])
+    return stadiums
+
+
+def brons_bulk_created(brons):
+    # bulk_create() does not send post_save, so callers report the batch here.
+    stats.record_many(brons)
+    stadium_ids = {bron.stadium_id for bron in brons}
+    transaction.on_commit(lambda: [_bron_changed(stadium_id) for stadium_id in stadium_ids])
+
+
+@receiver(post_save, sender=models.Bron)
+def bron_saved(sender, instance, created, **kwargs):
+    if created:
+        stats.record(instance, bookings=1, paid=int(instance.is_paid))
+
+        def on_commit():
+            slot_index.add(instance.stadium_id, instance.start_time, instance.end_time)
+            invalidate_free_slots(instance.stadium_id)
+            invalidate_stadium_availability()
+    else:
+        loaded = instance.loaded_values(['is_paid'])
+        if loaded and instance.is_paid != loaded['is_paid']:
+            stats.record(instance, paid=1 if instance.is_paid else -1)
+
+        def on_commit():
+            _bron_changed(instance.stadium_id)
+    transaction.on_commit(on_commit)
+
+
+@receiver(post_delete, sender=models.Bron)
+def bron_deleted(sender, instance, **kwargs):
+    stats.record(instance, bookings=-1, paid=-int(instance.is_paid))
+    transaction.on_commit(lambda: _bron_changed(instance.stadium_id))
+
+
+def _image_name(image):
+    return getattr(image, 'name', image) or ''
+
+
+@receiver(post_save, sender=models.Stadium)
+def stadium_saved(sender, instance, created, **kwargs):
+    _stadium_list_changed()
+
+    # Compared with the values loaded from the database; an instance built
+    # in memory and saved over an existing row has none.
+    loaded = instance.loaded_values(('is_active', 'image', *STADIUM_STAFF_FIELDS)) or {}
+
+    is_active = instance.is_active
+    if created:
+        models.StadiumCounter.shift(total=1, active=int(is_active), inactive=int(not is_active))
+    elif 'is_active' in loaded and is_active != loaded['is_active']:
+        step = 1 if is_active else -1
+        models.StadiumCounter.shift(active=step, inactive=-step)
+
+    # Owners and managers carry their stadium ids in role claims.
+    staff = _current_values(instance, STADIUM_STAFF_FIELDS)
+    loaded_staff = {field: loaded[field] for field in STADIUM_STAFF_FIELDS if field in loaded}
+    if created or staff != loaded_staff:
+        bump_token_versions({*staff.values(), *loaded_staff.values()})
+
+    image = _image_name(instance.__dict__.get('image'))
+    if (created and image) or (not created and 'image' in loaded and image != _image_name(loaded['image'])):
+        stadium_id = instance.pk
+        transaction.on_commit(lambda: _enqueue_image_variants(stadium_id))
+
+
+def _enqueue_image_variants(stadium_id):
+    # Runs after the stadium is committed, so a broker outage (or an eager task
+    # failure) must not turn the saved request into an error.
+    try:
+        tasks.generate_stadium_image_variants.delay(stadium_id)
+    except Exception:
+        logger.exception("Could not enqueue image variants of stadium %s", stadium_id)
+
+
+@receiver(post_delete, sender=models.Stadium)
+def stadium_deleted(sender, instance, **kwargs):
+    _stadium_list_changed()
+
+    was_active = (instance.loaded_values(['is_active']) or {}).get('is_active', instance.is_active)
+    models.StadiumCounter.shift(total=-1, active=-int(was_active), inactive=-int(not was_active))
+    bump_token_versions([instance.owner_id, instance.manager_id])
+
+
+def _current_values(instance, fields):
+    # Read __dict__ directly so deferred fields are not fetched one by one.
+    return {field: instance.__dict__[field] for field in fields if field in instance.__dict__}
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields is not None and not set(MANAGER_LIST_FIELDS) & set(update_fields):
+        return
+    changed = _current_values(instance, MANAGER_LIST_FIELDS) != instance.loaded_values(MANAGER_LIST_FIELDS)
+    if changed and _refresh_search_documents(models.Stadium.objects.filter(manager=instance)):
+        _stadium_list_changed()
+
+
+@receiver(pre_delete, sender=User)
+def user_deleting(sender, instance, **kwargs):
+    instance._managed_stadium_ids = list(
+        models.Stadium.objects.filter(manager=instance).values_list('id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    # Managed stadiums are detached with a queryset update (SET_NULL), which
+    # sends no Stadium signals.
+    _refresh_search_documents(models.Stadium.objects.filter(id__in=instance._managed_stadium_ids))
+    _stadium_list_changed()
@@ -0,0 +1,175 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, time as dt_time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from . import models
+
+HOUR = timedelta(hours=1)
+
+
+def _local_hour(value):
+    return timezone.localtime(value).replace(minute=0, second=0, microsecond=0)
+
+
+def _slots_version_key(stadium_id):
+    return f"bron-slots:version:{stadium_id}"
+
+
+def _day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, dt_time.min))
+    return start, start + timedelta(days=1)
+
+
+def _hours(start, end):
+    """Local (day, hour) pairs that [start, end) overlaps by a positive amount."""
+    current = _local_hour(start)
+    while current < end:
+        yield current.date(), current.hour
+        current = _local_hour(current + HOUR)
+
+
+def _full_hours(start, end):
+    """Local (day, hour) pairs entirely covered by [start, end)."""
+    current = _local_hour(start)
+    if current < start:
+        current = _local_hour(current + HOUR)
+    while current + HOUR <= end:
+        yield current.date(), current.hour
+        current = _local_hour(current + HOUR)
+
+
+class SlotIndex:
+    """
+    Per-process bitmap of occupied hours, keyed by (stadium_id, local day).
+
+    A set bit means the whole hour was covered by a booking when the day
+    was loaded; a miss proves nothing and callers still have to ask the
+    database. Days are loaded lazily with one query from committed rows
+    and kept right away, so repeated rejected attempts are answered from
+    memory. Each day remembers the stadium's version in the shared cache
+    when it was loaded; discard() bumps that version, so a booking deleted
+    or moved by any worker stops rejecting its hour in every process.
+    """
+
+    def __init__(self, ttl=60, max_days=10000):
+        self.ttl = ttl
+        self.max_days = max_days
+        self._days = OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_booked(self, stadium_id, start_time, end_time):
+        wanted = {}
+        for day, hour in _hours(start_time, end_time):
+            wanted[day] = wanted.get(day, 0) | 1 << hour
+
+        version = cache.get_or_set(_slots_version_key(stadium_id), time.time_ns(), None)
+        for day, mask in wanted.items():
+            if self._get_day(stadium_id, day, version) & mask:
+                return True
+        return False
+
+    def add(self, stadium_id, start_time, end_time):
+        with self._lock:
+            for day, hour in _full_hours(start_time, end_time):
+                entry = self._days.get((stadium_id, day))
+                if entry is not None:
+                    entry[1] |= 1 << hour
+
+    def discard(self, stadium_id):
+        cache.set(_slots_version_key(stadium_id), time.time_ns(), None)
+        with self._lock:
+            for key in [key for key in self._days if key[0] == stadium_id]:
+                del self._days[key]
+
+    def clear(self):
+        with self._lock:
+            self._days.clear()
+
+    def _get_day(self, stadium_id, day, version):
+        key = (stadium_id, day)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._days.get(key)
+            if entry is not None and entry[2] == version and now - entry[0] < self.ttl:
+                self._days.move_to_end(key)
+                return entry[1]
+
+        # Read after `version`, so a discard racing the load leaves it stale.
+        bitmap = self._load_day(stadium_id, day)
+        self._store(key, [now, bitmap, version])
+        return bitmap
+
+    def _load_day(self, stadium_id, day):
+        day_start, day_end = _day_bounds(day)
+        bitmap = 0
+        rows = models.Bron.objects.filter(
+            stadium_id=stadium_id,
+            start_time__lt=day_end,
+            end_time__gt=day_start
+        ).values_list('start_time', 'end_time')
+        for start_time, end_time in rows:
+            for bron_day, hour in _full_hours(start_time, end_time):
+                if bron_day == day:
+                    bitmap |= 1 << hour
+        return bitmap
+
+    def _store(self, key, entry):
+        with self._lock:
+            self._days[key] = entry
+            self._days.move_to_end(key)
+            while len(self._days) > self.max_days:
+                self._days.popitem(last=False)
+
+
+slot_index = SlotIndex(ttl=settings.BRON_SLOT_INDEX_TTL)
+
+
+def slots_start(date_from):
+    """
+    First hour free_slots can report for `date_from`: the local start of the
+    day, or the next full hour when the day has already begun, since bookings
+    cannot start in the past.
+    """
+    now = timezone.now()
+    next_hour = _local_hour(now)
+    if next_hour < now:
+        next_hour = _local_hour(next_hour + HOUR)
+    return max(_day_bounds(date_from)[0], next_hour)
+
+
+def free_slots(stadium_id, date_from, date_to):
+    """
+    Free hourly slots from slots_start(date_from) to the end of `date_to`,
+    found with one sweep over the bookings in that window.
+    """
+    window_start = slots_start(date_from)
+    window_end = _day_bounds(date_to)[1]
+    rows = models.Bron.objects.filter(
+        stadium_id=stadium_id,
+        start_time__lt=window_end,
+        end_time__gt=window_start
+    ).order_by('start_time').values_list('start_time', 'end_time')
+
+    busy = []
+    for start_time, end_time in rows:
+        if busy and start_time <= busy[-1][1]:
+            busy[-1][1] = max(busy[-1][1], end_time)
+        else:
+            busy.append([start_time, end_time])
+
+    slots = []
+    index = 0
+    current = window_start
+    while current < window_end:
+        slot_end = _local_hour(current + HOUR)
+        while index < len(busy) and busy[index][1] <= current:
+            index += 1
+        if index == len(busy) or busy[index][0] >= slot_end:
+            slots.append((current, slot_end))
+        current = slot_end
+    return slots
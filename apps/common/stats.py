@@ -0,0 +1,56 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import F
+from django.utils import timezone
+
+from . import models
+
+HOURS = Decimal('0.01')
+
+
+def bron_hours(bron):
+    return (Decimal((bron.end_time - bron.start_time).total_seconds()) / 3600).quantize(HOURS)
+
+
+def bron_delta(bron, bookings=0, paid=0):
+    """Rollup delta of one booking: `bookings` and `paid` are +1, 0 or -1."""
+    hours = bron_hours(bron) * paid
+    return {
+        'bookings': bookings,
+        'paid_hours': hours,
+        'income': hours * Decimal(bron.price_hour) if paid else Decimal(0),
+    }
+
+
+def apply(stadium_id, day, bookings=0, paid_hours=0, income=0):
+    rows = models.StadiumDailyStats.objects.filter(stadium_id=stadium_id, date=day)
+    updated = rows.update(
+        bookings=F('bookings') + bookings,
+        paid_hours=F('paid_hours') + paid_hours,
+        income=F('income') + income,
+    )
+    # Only growth creates a row: a missing row on the way down means the
+    # stadium (and its rollup) is being deleted in the same cascade.
+    if not updated and bookings >= 0 and paid_hours >= 0:
+        row, created = models.StadiumDailyStats.objects.get_or_create(
+            stadium_id=stadium_id, date=day,
+            defaults={'bookings': bookings, 'paid_hours': paid_hours, 'income': income}
+        )
+        if not created:
+            apply(stadium_id, day, bookings, paid_hours, income)
+
+
+def record(bron, bookings=0, paid=0):
+    apply(bron.stadium_id, timezone.localdate(bron.start_time), **bron_delta(bron, bookings, paid))
+
+
+def record_many(brons):
+    totals = defaultdict(lambda: {'bookings': 0, 'paid_hours': Decimal(0), 'income': Decimal(0)})
+    for bron in brons:
+        delta = bron_delta(bron, bookings=1, paid=int(bron.is_paid))
+        row = totals[bron.stadium_id, timezone.localdate(bron.start_time)]
+        for key, value in delta.items():
+            row[key] += value
+    for (stadium_id, day), delta in totals.items():
+        apply(stadium_id, day, **delta)
@@ -0,0 +1,49 @@
+from celery import shared_task
+from django.db.models import Q
+from django.utils import timezone
+
+from .caching import invalidate_stadium_list
+from .images import InvalidImage, build_image_variants, variant_files
+from .models import Stadium
+
+
+# Storage errors are retried; only an image that fails to decode is discarded.
+@shared_task(autoretry_for=(OSError,), retry_backoff=True, max_retries=3)
+def generate_stadium_image_variants(stadium_id):
+    stadium = Stadium.objects.filter(pk=stadium_id).first()
+    if stadium is None:
+        return
+    previous = stadium.image_variants
+    if stadium.image:
+        if previous.get('source') == stadium.image.name:
+            return
+        try:
+            variants = build_image_variants(stadium)
+        except InvalidImage:
+            # Uploads are only checked for an image signature; one that does not decode is dropped.
+            discard_stadium_image(stadium)
+            return
+        same_image = Q(image=stadium.image.name)
+    else:
+        variants = {}
+        same_image = Q(image='') | Q(image__isnull=True)
+
+    storage = stadium.image.storage
+    # Store the result only if the image was not replaced in the meantime;
+    # the task queued for the replacement takes over otherwise.
+    if Stadium.objects.filter(same_image, pk=stadium_id).update(image_variants=variants, updated_at=timezone.now()):
+        stale = variant_files(previous) - variant_files(variants)
+        invalidate_stadium_list()
+    else:
+        stale = variant_files(variants)
+    for name in stale:
+        storage.delete(name)
+
+
+def discard_stadium_image(stadium):
+    name = stadium.image.name
+    if Stadium.objects.filter(pk=stadium.pk, image=name).update(image='', image_variants={}, updated_at=timezone.now()):
+        stadium.image.storage.delete(name)
+        for stale in variant_files(stadium.image_variants):
+            stadium.image.storage.delete(stale)
+        invalidate_stadium_list()
@@ -0,0 +1,169 @@
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from rest_framework.throttling import BaseThrottle
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from apps.common.models import Stadium, Bron, StadiumCounter
+from apps.common.views import OwnerBronListAPIView
+from core.db_router import replica_reads_active
+import datetime
+from unittest import mock
+
+User = get_user_model()
+
+
+class AsyncReadAPIViewTest(APITestCase):
+    """The async endpoints answer like their synchronous counterparts."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(phone_number='+998977777777', password='password07', role='admin')
+        self.owner = User.objects.create_user(phone_number='+998911111111', password='password01', role='owner')
+        self.user = User.objects.create_user(phone_number='+998922222222', password='password02', role='user')
+        self.stadiums = [
+            Stadium.objects.create(
+                owner=self.owner,
+                name=f'Stadium {name}',
+                latitude='12.3459',
+                longitude='-34.9876',
+                price_hour='13000.00'
+            )
+            for name in 'ABC'
+        ]
+        start = timezone.now().replace(minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)
+        for k in range(12):
+            Bron.objects.create(
+                stadium=self.stadiums[k % 3],
+                user=self.user,
+                start_time=start + datetime.timedelta(hours=k),
+                end_time=start + datetime.timedelta(hours=k + 1),
+                is_paid=k % 2 == 0
+            )
+        self.user_token = str(RefreshToken.for_user(self.user).access_token)
+        self.client = APIClient()
+
+    def login(self, user):
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def assertSameResults(self, sync_url, async_url, params=None):
+        sync_response = self.client.get(sync_url, params)
+        async_response = self.client.get(async_url, params)
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.data['count'], sync_response.data['count'])
+        self.assertEqual(async_response.data['results'], sync_response.data['results'])
+        return async_response
+
+    def test_stadium_list(self):
+        self.login(self.user)
+        self.assertSameResults('/api/v1/common/stadium-list/', reverse('async-stadium-list'),
+                               {'search': 'stadium', 'limit': 2})
+
+    async def test_stadium_list_under_asgi(self):
+        response = await self.async_client.get(reverse('async-stadium-list'),
+                                               headers={'Authorization': f'Bearer {self.user_token}'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['count'], 3)
+
+    def test_stadium_list_answers_conditional_get(self):
+        self.login(self.user)
+        url = reverse('async-stadium-list')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(url, {'name': 'Stadium A'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+
+    def replica_reads(self, url, table):
+        """Whether each query the request sent to `table` was eligible for the replica."""
+        reads = []
+
+        def record(execute, sql, params, many, context):
+            if table in sql:
+                reads.append(replica_reads_active())
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(replica_reads_active())
+        return reads
+
+    def test_reads_go_to_replica(self):
+        cache.clear()
+        self.login(self.user)
+        reads = self.replica_reads(reverse('async-stadium-list'), 'common_stadium')
+        self.assertTrue(reads)
+        self.assertTrue(all(reads))
+
+        self.login(self.owner)
+        reads = self.replica_reads(reverse('async-owner-bron-list'), 'common_bron')
+        self.assertTrue(reads)
+        self.assertTrue(all(reads))
+
+    def test_throttles_apply(self):
+        class DenyAll(BaseThrottle):
+            def allow_request(self, request, view):
+                return False
+
+        self.login(self.owner)
+        with mock.patch.object(OwnerBronListAPIView, 'throttle_classes', [DenyAll]):
+            response = self.client.get(reverse('async-owner-bron-list'))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_stadium_list_requires_authentication(self):
+        response = self.client.get(reverse('async-stadium-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer not-a-token')
+        response = self.client.get(reverse('async-stadium-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_owner_bron_list(self):
+        self.login(self.owner)
+        response = self.assertSameResults(reverse('owner-bron-list'), reverse('async-owner-bron-list'),
+                                          {'is_paid': 'true', 'ordering': '-start_time'})
+        self.assertEqual(response.data['count'], 6)
+
+    def test_owner_bron_list_keyset(self):
+        self.login(self.owner)
+        url = reverse('async-owner-bron-list')
+        response = self.client.get(url, {'pagination': 'cursor', 'limit': 5})
+        self.assertEqual(len(response.data['results']), 5)
+        seen = len(response.data['results'])
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            seen += len(response.data['results'])
+        self.assertEqual(seen, 12)
+
+    def test_owner_bron_list_forbidden_for_users(self):
+        self.login(self.user)
+        response = self.client.get(reverse('async-owner-bron-list'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_owner_stadium_statistic(self):
+        self.login(self.owner)
+        self.assertSameResults(reverse('owner-stadium-statistic'), reverse('async-owner-stadium-statistic'))
+
+        response = self.client.get(reverse('async-owner-stadium-statistic'), {'from': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_stadium_status(self):
+        StadiumCounter.objects.all().delete()
+        self.login(self.admin)
+        response = self.client.get(reverse('async-status-count'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'total_stadiums': 3, 'active_stadiums': 3, 'inactive_stadiums': 0})
+
+        self.login(self.user)
+        response = self.client.get(reverse('async-status-count'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,56 @@
+from rest_framework.test import APITestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from io import StringIO
+from apps.common.management.commands.bench_api import SCENARIOS
+from apps.common.management.commands.bench_payloads import ENDPOINTS
+from apps.common.models import Stadium, Bron, StadiumCounter
+from apps.user.authentication import user_cache
+import json
+
+
+class BenchApiCommandTest(APITestCase):
+    def setUp(self):
+        # Users are bulk-created, so nothing evicts users cached by earlier tests under reused ids.
+        cache.clear()
+        user_cache.clear()
+
+    def test_bench_reports_every_scenario(self):
+        out = StringIO()
+        call_command(
+            'bench_api', '--in-place', '--stadiums', '4', '--users', '10', '--brons-per-stadium', '20',
+            '--requests', '3', '--concurrency', '1', stdout=out
+        )
+        report = json.loads(out.getvalue())
+
+        self.assertEqual(Stadium.objects.count(), 4)
+        self.assertEqual(StadiumCounter.get().total, 4)
+        self.assertEqual(Bron.objects.count(), 4 * 20 + 3)
+        self.assertEqual(set(report['scenarios']), set(SCENARIOS))
+        for name, result in report['scenarios'].items():
+            self.assertEqual(result['errors'], 0, name)
+            self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+            self.assertLessEqual(result['p95_ms'], result['p99_ms'])
+            self.assertGreater(result['queries_per_request'], 0)
+
+
+@override_settings(API_COMPRESSION_MIN_SIZE=0)
+class BenchPayloadsCommandTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+
+    def test_bench_reports_render_times_and_sizes(self):
+        out = StringIO()
+        call_command(
+            'bench_payloads', '--in-place', '--stadiums', '4', '--users', '10', '--brons-per-stadium', '20',
+            '--limit', '50', '--repeat', '2', stdout=out
+        )
+        report = json.loads(out.getvalue())
+
+        self.assertEqual(set(report['endpoints']), set(ENDPOINTS))
+        for name, result in report['endpoints'].items():
+            self.assertGreater(result['rows'], 0, name)
+            self.assertGreater(result['render_ms']['drf'], 0)
+            self.assertLess(result['bytes']['gzip'], result['bytes']['identity'])
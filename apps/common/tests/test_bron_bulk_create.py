@@ -0,0 +1,122 @@
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.common.models import Stadium, Bron, Team
+from django.urls import reverse
+from django.utils import timezone
+import datetime
+
+User = get_user_model()
+
+
+class BronBulkCreateAPIViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(phone_number='+998911111111', password='password01', role='user')
+        self.manager = User.objects.create_user(phone_number='+998922222222', password='password02', role='manager')
+        self.owner = User.objects.create_user(phone_number='+998933333333', password='password03', role='owner')
+        self.stadium = Stadium.objects.create(
+            owner=self.owner,
+            name='Test Stadium',
+            latitude='12.3459',
+            longitude='-34.9876',
+            price_hour='13000.00'
+        )
+        self.team = Team.objects.create(name='User Team', owner=self.user)
+
+        self.client = APIClient()
+        self.url = reverse('bron-bulk-create')
+
+        tomorrow = timezone.localtime() + datetime.timedelta(days=1)
+        self.start_time = tomorrow.replace(hour=18, minute=0, second=0, microsecond=0)
+        self.end_time = self.start_time + datetime.timedelta(hours=1)
+        self.recurrence_data = {
+            'stadium': self.stadium.id,
+            'order_type': 'cash',
+            'is_team': True,
+            'team': self.team.id,
+            'recurrence': {
+                'start_time': self.start_time.isoformat(),
+                'end_time': self.end_time.isoformat(),
+                'count': 20,
+            }
+        }
+
+    def test_bulk_create_weekly_recurrence(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url, self.recurrence_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['slots']), 20)
+        self.assertEqual(Bron.objects.filter(team=self.team, user=self.user).count(), 20)
+        last = Bron.objects.order_by('-start_time').first()
+        self.assertEqual(last.start_time, self.start_time + datetime.timedelta(weeks=19))
+
+    def test_bulk_create_slot_list(self):
+        self.client.force_authenticate(user=self.user)
+        data = {
+            'stadium': self.stadium.id,
+            'is_team': False,
+            'slots': [
+                {'start_time': self.start_time.isoformat(), 'end_time': self.end_time.isoformat()},
+                {
+                    'start_time': (self.start_time + datetime.timedelta(days=2)).isoformat(),
+                    'end_time': (self.end_time + datetime.timedelta(days=2, hours=1)).isoformat(),
+                },
+            ]
+        }
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Bron.objects.count(), 2)
+
+    def test_bulk_create_rejects_whole_batch_on_conflict(self):
+        Bron.objects.create(
+            stadium=self.stadium,
+            user=self.manager,
+            start_time=self.start_time + datetime.timedelta(weeks=3, minutes=30),
+            end_time=self.end_time + datetime.timedelta(weeks=3, minutes=30),
+        )
+        self.client.force_authenticate(user=self.user)
+        with self.assertNumQueries(6):
+            response = self.client.post(self.url, self.recurrence_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('This time slot is already booked', str(response.data))
+        self.assertEqual(len(response.data['booked']), 1)
+        self.assertEqual(Bron.objects.count(), 1)
+
+    def test_bulk_create_overlapping_slots(self):
+        self.client.force_authenticate(user=self.user)
+        data = {
+            'stadium': self.stadium.id,
+            'is_team': False,
+            'slots': [
+                {'start_time': self.start_time.isoformat(), 'end_time': (self.end_time + datetime.timedelta(hours=1)).isoformat()},
+                {'start_time': self.end_time.isoformat(), 'end_time': (self.end_time + datetime.timedelta(hours=1)).isoformat()},
+            ]
+        }
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('The requested slots overlap each other', str(response.data))
+
+    def test_bulk_create_requires_slots_or_recurrence(self):
+        self.client.force_authenticate(user=self.user)
+        data = {'stadium': self.stadium.id, 'is_team': False}
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_too_many_occurrences(self):
+        self.client.force_authenticate(user=self.user)
+        self.recurrence_data['recurrence']['count'] = 100
+        response = self.client.post(self.url, self.recurrence_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_as_manager(self):
+        self.client.force_authenticate(user=self.manager)
+        self.recurrence_data['is_team'] = False
+        self.recurrence_data['team'] = None
+        response = self.client.post(self.url, self.recurrence_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Admins and Managers cannot book stadiums', str(response.data))
+        self.assertEqual(Bron.objects.count(), 0)
+
+    def test_bulk_create_unauthenticated(self):
+        response = self.client.post(self.url, self.recurrence_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -2,6 +2,9 @@ from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
 from apps.common.models import Stadium, Bron, Team
+from apps.common.serializers import BronCreateSerializer
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIRequestFactory
 from django.urls import reverse
 from django.utils import timezone
 import datetime
@@ -135,4 +138,23 @@ class BronCreateAPIViewTest(APITestCase):
         response = self.client.post(self.url, invalid_duration_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('The booking time was not available', str(response.data))
-        self.assertEqual(Bron.objects.count(), 0)
\ No newline at end of file
+        self.assertEqual(Bron.objects.count(), 0)
+
+    def test_create_bron_constraint_violation_is_reported_as_booked(self):
+        start_time = timezone.now() + datetime.timedelta(hours=1)
+        end_time = start_time + datetime.timedelta(hours=1)
+        Bron.objects.create(stadium=self.stadium, user=self.other_user, start_time=start_time, end_time=end_time)
+
+        request = APIRequestFactory().post(self.url)
+        request.user = self.user
+        serializer = BronCreateSerializer(context={'request': request})
+        with self.assertRaises(ValidationError) as error:
+            serializer.create({
+                'stadium': self.stadium,
+                'start_time': start_time,
+                'end_time': end_time,
+                'order_type': 'cash',
+                'is_team': False,
+            })
+        self.assertIn('This time slot is already booked', str(error.exception.detail))
+        self.assertEqual(Bron.objects.count(), 1)
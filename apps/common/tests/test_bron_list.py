@@ -115,4 +115,45 @@ class OwnerBronListAPIViewTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 2, f"Expected 2 items, got {len(response.data['results'])}")
         self.assertEqual(response.data['results'][0]['end_time'], '2025-04-15 16:00:00')  # Adjusted to UTC+5
-        self.assertEqual(response.data['results'][1]['end_time'], '2025-04-15 18:00:00')  # Adjusted to UTC+5
\ No newline at end of file
+        self.assertEqual(response.data['results'][1]['end_time'], '2025-04-15 18:00:00')  # Adjusted to UTC+5
+
+    def test_keyset_pagination_walks_all_pages(self):
+        start = datetime.datetime(2025, 4, 16, 8, 0, tzinfo=datetime.timezone.utc)
+        for i in range(5):
+            Bron.objects.create(
+                stadium=self.stadium1,
+                user=self.owner_user,
+                start_time=start,
+                end_time=start + datetime.timedelta(hours=1 + i),
+            )
+        self.client.force_authenticate(user=self.owner_user)
+
+        response = self.client.get(self.url, {'pagination': 'cursor', 'limit': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        seen = [item['end_time'] for item in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(item['end_time'] for item in response.data['results'])
+
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+
+    def test_keyset_pagination_descending_with_filter(self):
+        self.client.force_authenticate(user=self.owner_user)
+        response = self.client.get(self.url, {'pagination': 'cursor', 'limit': 1, 'ordering': '-start_time'})
+        self.assertEqual(response.data['results'][0]['stadium_name'], 'Stadium B')
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.data['results'][0]['stadium_name'], 'Stadium A')
+        self.assertIsNone(response.data['next'])
+
+        response = self.client.get(self.url, {'pagination': 'cursor', 'is_paid': 'false'})
+        self.assertEqual([item['stadium_name'] for item in response.data['results']], ['Stadium B'])
+
+    def test_keyset_pagination_rejects_bad_input(self):
+        self.client.force_authenticate(user=self.owner_user)
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(self.url, {'pagination': 'cursor', 'ordering': 'end_time'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
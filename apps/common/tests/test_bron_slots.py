@@ -0,0 +1,119 @@
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from apps.common.models import Stadium, Bron
+from apps.common.slots import SlotIndex, slot_index
+from django.urls import reverse
+from django.utils import timezone
+import datetime
+from unittest import mock
+
+User = get_user_model()
+
+
+class SlotIndexTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        slot_index.clear()
+        self.user = User.objects.create_user(phone_number='+998911111111', password='password01', role='user')
+        self.owner = User.objects.create_user(phone_number='+998922222222', password='password02', role='owner')
+        self.stadium = Stadium.objects.create(
+            owner=self.owner,
+            name='Test Stadium',
+            latitude='12.3459',
+            longitude='-34.9876',
+            price_hour='13000.00'
+        )
+        tomorrow = timezone.localtime() + datetime.timedelta(days=1)
+        self.day_start = tomorrow.replace(hour=0, minute=0, second=0, microsecond=0)
+        self.client = APIClient()
+        self.url = reverse('bron-create')
+
+    def at(self, hour, minute=0):
+        return self.day_start + datetime.timedelta(hours=hour, minutes=minute)
+
+    def test_loaded_day_answers_without_query(self):
+        Bron.objects.create(stadium=self.stadium, user=self.user, start_time=self.at(18), end_time=self.at(20))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(slot_index.is_booked(self.stadium.id, self.at(19), self.at(20)))
+
+        with self.assertNumQueries(0):
+            self.assertTrue(slot_index.is_booked(self.stadium.id, self.at(17, 30), self.at(18, 30)))
+            self.assertFalse(slot_index.is_booked(self.stadium.id, self.at(20), self.at(21)))
+
+    def test_partially_covered_hour_is_not_a_hit(self):
+        Bron.objects.create(stadium=self.stadium, user=self.user, start_time=self.at(10, 30), end_time=self.at(11, 30))
+        self.assertFalse(slot_index.is_booked(self.stadium.id, self.at(10), self.at(11)))
+
+    def test_rejected_attempts_reuse_the_loaded_day(self):
+        Bron.objects.create(stadium=self.stadium, user=self.user, start_time=self.at(10), end_time=self.at(12))
+        self.client.force_authenticate(user=self.user)
+        data = {
+            'stadium': self.stadium.id,
+            'start_time': self.at(10).isoformat(),
+            'end_time': self.at(11).isoformat(),
+            'order_type': 'cash',
+            'is_team': False,
+        }
+        # The rejection rolls back the request transaction.
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("This time slot is already booked.", str(response.data))
+        with self.assertNumQueries(0):
+            self.assertTrue(slot_index.is_booked(self.stadium.id, self.at(10), self.at(11)))
+
+    def test_load_racing_a_discard_is_not_kept(self):
+        load_day = slot_index._load_day
+
+        def load_then_discard(stadium_id, day):
+            bitmap = load_day(stadium_id, day)
+            slot_index.discard(stadium_id)
+            return bitmap
+
+        with mock.patch.object(slot_index, '_load_day', load_then_discard):
+            slot_index.is_booked(self.stadium.id, self.at(10), self.at(11))
+        with self.assertNumQueries(1):
+            slot_index.is_booked(self.stadium.id, self.at(10), self.at(11))
+
+    def test_deletes_in_other_workers_free_the_slot(self):
+        bron = Bron.objects.create(stadium=self.stadium, user=self.user, start_time=self.at(8), end_time=self.at(9))
+        worker = SlotIndex()
+        self.assertTrue(worker.is_booked(self.stadium.id, self.at(8), self.at(9)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bron.delete()
+        self.assertFalse(worker.is_booked(self.stadium.id, self.at(8), self.at(9)))
+
+    def test_created_bron_marks_loaded_day(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertFalse(slot_index.is_booked(self.stadium.id, self.at(8), self.at(9)))
+
+        self.client.force_authenticate(user=self.user)
+        data = {
+            'stadium': self.stadium.id,
+            'start_time': self.at(8).isoformat(),
+            'end_time': self.at(9).isoformat(),
+            'order_type': 'cash',
+            'is_team': False,
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(slot_index.is_booked(self.stadium.id, self.at(8), self.at(9)))
+
+        data['start_time'] = self.at(7).isoformat()
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("This time slot is already booked.", str(response.data))
+
+    def test_deleted_bron_frees_the_slot(self):
+        bron = Bron.objects.create(stadium=self.stadium, user=self.user, start_time=self.at(8), end_time=self.at(9))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(slot_index.is_booked(self.stadium.id, self.at(8), self.at(9)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bron.delete()
+        self.assertFalse(slot_index.is_booked(self.stadium.id, self.at(8), self.at(9)))
@@ -0,0 +1,114 @@
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import parse_http_date
+from apps.common.caching import STADIUM_AVAILABILITY_VERSION_KEY, STADIUM_LIST_VERSION_KEY
+from apps.common.models import Stadium
+import datetime
+
+User = get_user_model()
+
+
+class StadiumConditionalGetTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(phone_number='+998911111111', password='password01', role='owner')
+        self.user = User.objects.create_user(phone_number='+998922222222', password='password02', role='user')
+        self.stadium = Stadium.objects.create(
+            owner=self.owner, name='Test Stadium', latitude='12.3459', longitude='-34.9876', price_hour='13000.00'
+        )
+        self.client = APIClient()
+        self.list_url = '/api/v1/common/stadium-list/'
+        self.detail_url = reverse('stadium-detail', kwargs={'pk': self.stadium.pk})
+
+    def test_list_answers_if_none_match(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(response.content)
+
+        other = self.client.get(self.list_url, {'name': 'Test Stadium'})
+        self.assertNotEqual(other['ETag'], etag)
+
+    def test_list_etag_changes_with_stadiums(self):
+        self.client.force_authenticate(user=self.user)
+        etag = self.client.get(self.list_url)['ETag']
+        Stadium.objects.create(
+            owner=self.owner, name='Second Stadium', latitude='12.3459', longitude='-34.9876', price_hour='13000.00'
+        )
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_validators_are_recomputed_in_one_query(self):
+        self.client.force_authenticate(user=self.user)
+        etag = self.client.get(self.list_url)['ETag']
+        version = cache.get(STADIUM_LIST_VERSION_KEY)
+        cache.clear()
+        cache.set(STADIUM_LIST_VERSION_KEY, version, None)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_validators_follow_bookings(self):
+        self.client.force_authenticate(user=self.user)
+        start = timezone.now().replace(minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)
+        window = {'available_from': start.isoformat(), 'available_to': (start + datetime.timedelta(hours=1)).isoformat()}
+        etag = self.client.get(self.list_url, window)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('bron-create'), {
+                'stadium': self.stadium.id, 'start_time': start.isoformat(),
+                'end_time': (start + datetime.timedelta(hours=1)).isoformat(), 'is_team': False,
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.get(self.list_url, window, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 0)
+        version = cache.get(STADIUM_AVAILABILITY_VERSION_KEY)
+        self.assertEqual(parse_http_date(response['Last-Modified']), version // 10 ** 9)
+
+    def test_list_answers_if_modified_since(self):
+        self.client.force_authenticate(user=self.user)
+        last_modified = self.client.get(self.list_url)['Last-Modified']
+        response = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_answers_conditional_get(self):
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len([q for q in queries if q['sql'].startswith('SELECT')]), 1)
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.stadium.price_hour = '15000.00'
+        self.stadium.save()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['price_hour'], '15000.00')
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_detail_of_unknown_stadium(self):
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.get(reverse('stadium-detail', kwargs={'pk': self.stadium.pk + 1}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get('/api/v1/common/stadium/abc/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
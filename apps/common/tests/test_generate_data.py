@@ -0,0 +1,54 @@
+from rest_framework.test import APITestCase
+from django.core.management import call_command
+from django.db.models import Count, Sum
+from io import StringIO
+from apps.common.models import Stadium, Bron, Team, StadiumCounter, StadiumDailyStats
+from apps.common.stats import bron_hours
+from apps.user.models import User
+
+
+class GenerateDataCommandTest(APITestCase):
+    def generate(self, *args):
+        call_command('generate_data', '--brons', '300', '--stadiums', '7', '--users', '40',
+                     '--batch-size', '50', *args, stdout=StringIO())
+
+    def test_generates_requested_volume(self):
+        self.generate()
+        self.assertEqual(Stadium.objects.count(), 7)
+        self.assertEqual(Bron.objects.count(), 7 * 43)
+        self.assertEqual(User.objects.filter(role='user').count(), 40)
+        self.assertEqual(Team.objects.count(), 4)
+        self.assertEqual(StadiumCounter.get().total, 7)
+
+        owners = User.objects.filter(role='owner').annotate(stadiums=Count('stadium_owner'))
+        self.assertEqual(owners.count(), 3)
+        self.assertLessEqual(max(owner.stadiums for owner in owners), 3)
+
+    def test_brons_are_whole_hours_and_never_overlap(self):
+        self.generate()
+        previous = {}
+        for bron in Bron.objects.order_by('stadium_id', 'start_time'):
+            duration = (bron.end_time - bron.start_time).total_seconds()
+            self.assertEqual(duration % 3600, 0)
+            self.assertGreaterEqual(duration, 3600)
+            if bron.stadium_id in previous:
+                self.assertGreaterEqual(bron.start_time, previous[bron.stadium_id])
+            previous[bron.stadium_id] = bron.end_time
+            if bron.team_id:
+                self.assertEqual(bron.team.owner_id, bron.user_id)
+
+    def test_daily_stats_match_the_bookings(self):
+        self.generate()
+        stats = StadiumDailyStats.objects.aggregate(bookings=Sum('bookings'), income=Sum('income'))
+        self.assertEqual(stats['bookings'], Bron.objects.count())
+        income = sum(
+            bron_hours(bron) * bron.stadium.price_hour
+            for bron in Bron.objects.filter(is_paid=True).select_related('stadium')
+        )
+        self.assertEqual(stats['income'], income)
+
+    def test_reruns_add_new_users(self):
+        self.generate()
+        self.generate('--seed', '1')
+        self.assertEqual(Stadium.objects.count(), 14)
+        self.assertEqual(User.objects.filter(role='owner').count(), 6)
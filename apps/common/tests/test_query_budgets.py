@@ -0,0 +1,118 @@
+from asgiref.sync import sync_to_async
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from unittest import mock
+from apps.common import views
+from apps.common.models import Stadium, Bron, Team
+from core.query_budget import QueryBudgetExceeded, QueryBudgetTestMixin
+import datetime
+
+User = get_user_model()
+
+
+class QueryBudgetTest(QueryBudgetTestMixin, APITestCase):
+    """Read endpoints stay within their query_budget however many rows a page holds."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(phone_number='+998900000000', password='password00', role='admin')
+        cls.owner = User.objects.create_user(phone_number='+998911111111', password='password01', role='owner')
+        cls.user = User.objects.create_user(phone_number='+998922222222', password='password02', role='user')
+        start = timezone.now().replace(minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)
+        for n in range(3):
+            manager = User.objects.create_user(phone_number=f'+99893000000{n}', password='password03', role='manager')
+            stadium = Stadium.objects.create(
+                owner=cls.owner,
+                manager=manager,
+                name=f'Stadium {n}',
+                latitude='41.3111',
+                longitude='69.2797',
+                price_hour='13000.00'
+            )
+            team = Team.objects.create(name=f'Team {n}', owner=cls.user)
+            for k in range(4):
+                Bron.objects.create(
+                    stadium=stadium,
+                    user=cls.user,
+                    team=team,
+                    start_time=start + datetime.timedelta(hours=2 * k),
+                    end_time=start + datetime.timedelta(hours=2 * k + 1)
+                )
+        cls.stadium = stadium
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def login(self, user):
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def get(self, view, url, data=None):
+        with self.assertWithinQueryBudget(view):
+            response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response
+
+    def test_owner_bron_list(self):
+        self.login(self.owner)
+        url = reverse('owner-bron-list')
+        response = self.get(views.OwnerBronListAPIView, url)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual(response.data['results'][0]['team_name'], 'Team 0')
+        self.get(views.OwnerBronListAPIView, url, {'pagination': 'cursor'})
+
+    def test_owner_stadium_statistic(self):
+        self.login(self.owner)
+        response = self.get(views.OwnerStadiumStatsView, reverse('owner-stadium-statistic'))
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_stadium_list(self):
+        self.login(self.user)
+        response = self.get(views.StadiumListAPIView, '/api/v1/common/stadium-list/')
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIsNotNone(response.data['results'][0]['manager'])
+
+    def test_stadium_nearby(self):
+        self.login(self.user)
+        response = self.get(views.StadiumNearbyAPIView, reverse('stadium-nearby'), {'lat': '41.31', 'lng': '69.28'})
+        self.assertEqual(len(response.data), 3)
+
+    def test_stadium_free_slots(self):
+        self.login(self.user)
+        self.get(views.StadiumFreeSlotsAPIView, reverse('stadium-free-slots', kwargs={'pk': self.stadium.pk}))
+
+    def test_stadium_status(self):
+        self.login(self.admin)
+        self.get(views.StadiumStatsCountAPIView, reverse('status-count'))
+
+    @override_settings(QUERY_BUDGET_ENFORCE=True)
+    def test_middleware_rejects_views_over_budget(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        with mock.patch.object(views.StadiumListAPIView, 'query_budget', 1):
+            with self.assertRaises(QueryBudgetExceeded):
+                client.get('/api/v1/common/stadium-list/')
+
+    @override_settings(QUERY_BUDGET_ENFORCE=True)
+    async def test_middleware_counts_async_views(self):
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.user).access_token))()
+        headers = {'Authorization': f'Bearer {token}'}
+        response = await self.async_client.get(reverse('async-stadium-list'), headers=headers)
+        self.assertEqual(response.status_code, 200)
+        await cache.aclear()
+        with mock.patch.object(views.StadiumListAPIView, 'query_budget', 1):
+            with self.assertRaises(QueryBudgetExceeded):
+                await self.async_client.get(reverse('async-stadium-list'), headers=headers)
+
+    @override_settings(DEBUG=True, QUERY_BUDGET_ENFORCE=True)
+    def test_middleware_chain_stays_async_under_asgi(self):
+        # Django logs each middleware it has to adapt to the other mode when DEBUG is on.
+        with self.assertNoLogs('django.request', 'DEBUG'):
+            ASGIHandler()
@@ -0,0 +1,205 @@
+import datetime
+import re
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from apps.common.models import Stadium, Bron, StadiumDailyStats
+from apps.common.slots import slot_index
+
+User = get_user_model()
+
+HOT_TABLES = {'common_bron', 'common_stadium', 'common_stadiumcounter', 'common_stadiumdailystats'}
+OWNERS = 60
+BRONS_PER_STADIUM = 60
+
+
+def query_plan(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN {sql}' if connection.vendor == 'postgresql' else f'EXPLAIN QUERY PLAN {sql}')
+        return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+
+
+def full_table_scans(sql):
+    """Hot tables that the plan for `sql` reads with a sequential scan."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # Plans are checked for index *usability*: with sequential scans
+            # priced out, a remaining Seq Scan means no index can serve it.
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN {sql}')
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+            cursor.execute('SET LOCAL enable_seqscan = on')
+            scans = re.findall(r'Seq Scan on (\w+)', plan)
+        else:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            scans = [
+                match.group(1)
+                for row in cursor.fetchall()
+                for match in [re.match(r'SCAN (?:TABLE )?(\w+)$', row[-1])]
+                if match
+            ]
+    return {table for table in scans if table in HOT_TABLES}
+
+
+class QueryPlanTest(APITestCase):
+    """
+    Seeds a few thousand bookings and checks that every query the
+    apps.common endpoints send to the hot tables is served by an index.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(phone_number='+998900000000', password='password00', role='admin')
+        cls.manager = User.objects.create_user(phone_number='+998900000001', password='password01', role='manager')
+        cls.user = User.objects.create_user(phone_number='+998900000002', password='password02', role='user')
+        owners = User.objects.bulk_create([
+            User(phone_number=f'+99891{i:07d}', role='owner') for i in range(OWNERS)
+        ])
+        stadiums = Stadium.objects.bulk_create([
+            Stadium(
+                owner=owner,
+                name=f'Stadium {owner.pk}-{n}',
+                latitude=Decimal('41.2') + Decimal(i) / 1000,
+                longitude=Decimal('69.2') + Decimal(n) / 100,
+                geohash='',
+                price_hour=Decimal('10000.00') + i,
+                is_active=bool(i % 5),
+            )
+            for i, owner in enumerate(owners)
+            for n in range(3)
+        ])
+        start = timezone.now().replace(minute=0, second=0, microsecond=0) - datetime.timedelta(days=30)
+        Bron.objects.bulk_create([
+            Bron(
+                user=cls.user,
+                stadium=stadium,
+                price_hour=stadium.price_hour,
+                start_time=start + datetime.timedelta(hours=3 * k),
+                end_time=start + datetime.timedelta(hours=3 * k + 1),
+                is_paid=bool(k % 2),
+            )
+            for stadium in stadiums
+            for k in range(BRONS_PER_STADIUM)
+        ])
+        StadiumDailyStats.objects.bulk_create([
+            StadiumDailyStats(stadium=stadium, date=start.date() + datetime.timedelta(days=d), bookings=8)
+            for stadium in stadiums
+            for d in range(BRONS_PER_STADIUM // 8)
+        ])
+        for stadium in Stadium.objects.all():
+            stadium.save(update_fields=['latitude', 'longitude'])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        cls.owner = owners[7]
+        cls.stadium = Stadium.objects.filter(owner=cls.owner, is_active=True).first()
+        cls.bron = Bron.objects.filter(stadium=cls.stadium).first()
+
+    def setUp(self):
+        cache.clear()
+        slot_index.clear()
+        self.client = APIClient()
+
+    def assertUsesIndexes(self, user, method, url, data=None):
+        self.client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data, format='json')
+        self.assertLess(response.status_code, 400, response.data)
+
+        checked = 0
+        for query in queries:
+            sql = query['sql']
+            if not re.match(r'\s*(SELECT|UPDATE|DELETE)\b', sql) or not HOT_TABLES & set(re.findall(r'"(\w+)"', sql)):
+                continue
+            checked += 1
+            self.assertEqual(full_table_scans(sql), set(), f"{method.upper()} {url} scans a table:\n{sql}")
+        self.assertGreater(checked, 0)
+        return response
+
+    def test_plan_check_detects_full_scans(self):
+        self.assertEqual(full_table_scans('SELECT * FROM "common_bron" WHERE "is_paid"'), {'common_bron'})
+
+    def test_stadium_viewset(self):
+        self.assertUsesIndexes(self.owner, 'get', '/api/v1/common/stadium/')
+        self.assertUsesIndexes(self.owner, 'get', reverse('stadium-detail', kwargs={'pk': self.stadium.pk}))
+
+    def test_stadium_list(self):
+        url = '/api/v1/common/stadium-list/'
+        self.assertUsesIndexes(self.user, 'get', url)
+        self.assertUsesIndexes(self.user, 'get', url, {'ordering': 'name', 'offset': 100})
+
+    def test_stadium_list_available(self):
+        url = '/api/v1/common/stadium-list/'
+        start = timezone.now() + datetime.timedelta(days=1)
+        self.assertUsesIndexes(self.user, 'get', url, {
+            'available_from': start.isoformat(),
+            'available_to': (start + datetime.timedelta(hours=2)).isoformat(),
+            'ordering': 'name',
+        })
+
+    def test_stadium_nearby(self):
+        response = self.assertUsesIndexes(self.user, 'get', reverse('stadium-nearby'), {
+            'lat': '41.23', 'lng': '69.21', 'radius': 3,
+        })
+        self.assertTrue(response.data)
+
+    def test_stadium_status(self):
+        self.assertUsesIndexes(self.admin, 'get', reverse('status-count'))
+
+    def test_stadium_free_slots(self):
+        url = reverse('stadium-free-slots', kwargs={'pk': self.stadium.pk})
+        self.assertUsesIndexes(self.user, 'get', url, {'from': timezone.localdate().isoformat()})
+
+    def test_bron_create(self):
+        start = timezone.now().replace(minute=0, second=0, microsecond=0) + datetime.timedelta(days=2)
+        self.assertUsesIndexes(self.user, 'post', reverse('bron-create'), {
+            'stadium': self.stadium.pk,
+            'start_time': start.isoformat(),
+            'end_time': (start + datetime.timedelta(hours=1)).isoformat(),
+            'is_team': False,
+        })
+
+    def test_bron_bulk_create(self):
+        start = timezone.now().replace(minute=0, second=0, microsecond=0) + datetime.timedelta(days=2)
+        self.assertUsesIndexes(self.user, 'post', reverse('bron-bulk-create'), {
+            'stadium': self.stadium.pk,
+            'is_team': False,
+            'recurrence': {
+                'start_time': start.isoformat(),
+                'end_time': (start + datetime.timedelta(hours=1)).isoformat(),
+                'count': 10,
+            },
+        })
+
+    def test_bron_update(self):
+        url = reverse('bron-update', kwargs={'pk': self.bron.pk})
+        self.assertUsesIndexes(self.manager, 'patch', url, {'is_paid': not self.bron.is_paid})
+
+    def test_owner_bron_list(self):
+        url = reverse('owner-bron-list')
+        self.assertUsesIndexes(self.owner, 'get', url)
+        self.assertUsesIndexes(self.owner, 'get', url, {'is_paid': 'true', 'ordering': '-start_time'})
+        response = self.assertUsesIndexes(self.owner, 'get', url, {'pagination': 'cursor'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertUsesIndexes(self.owner, 'get', response.data['next'])
+
+    def test_owner_bron_keyset_page_seeks_per_stadium(self):
+        url = reverse('owner-bron-list')
+        response = self.assertUsesIndexes(self.owner, 'get', url, {'pagination': 'cursor'})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(response.data['next'])
+        page_sql = next(query['sql'] for query in queries if 'ORDER BY "common_bron"."start_time"' in query['sql'])
+        self.assertIn('bron_stadium_start_id_idx', query_plan(page_sql))
+
+    def test_owner_stadium_statistic(self):
+        url = reverse('owner-stadium-statistic')
+        self.assertUsesIndexes(self.owner, 'get', url)
+        self.assertUsesIndexes(self.owner, 'get', url, {'from': timezone.localdate().isoformat()})
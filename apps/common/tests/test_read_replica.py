@@ -0,0 +1,128 @@
+from asgiref.sync import sync_to_async
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from unittest import mock
+from apps.common.caching import invalidate_stadium_list
+from apps.common.models import Stadium
+from core.db_router import ReplicaRouter, is_pinned, pin_to_primary, replica_reads_active, _replica_reads
+import datetime
+
+User = get_user_model()
+
+
+class ReplicaRouterTest(APITestCase):
+    def test_routes_reads_only_while_switched_on(self):
+        router = ReplicaRouter()
+        with mock.patch.dict('django.conf.settings.DATABASES', {'replica': {}}):
+            self.assertIsNone(router.db_for_read(Stadium))
+            token = _replica_reads.set(True)
+            try:
+                self.assertEqual(router.db_for_read(Stadium), 'replica')
+                self.assertIsNone(router.db_for_write(Stadium))
+            finally:
+                _replica_reads.reset(token)
+        self.assertFalse(router.allow_migrate('replica', 'common'))
+        self.assertTrue(router.allow_migrate('default', 'common'))
+
+    def test_no_replica_configured(self):
+        token = _replica_reads.set(True)
+        try:
+            self.assertIsNone(ReplicaRouter().db_for_read(Stadium))
+        finally:
+            _replica_reads.reset(token)
+
+
+class ReplicaReadViewTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(phone_number='+998911111111', password='password01', role='owner')
+        self.user = User.objects.create_user(phone_number='+998922222222', password='password02', role='user')
+        self.admin = User.objects.create_user(phone_number='+998977777777', password='password07', role='admin')
+        self.stadium = Stadium.objects.create(
+            owner=self.owner,
+            name='Test Stadium',
+            latitude='12.3459',
+            longitude='-34.9876',
+            price_hour='13000.00'
+        )
+        self.client = APIClient()
+
+    def replica_reads(self, user, method, url, data=None):
+        """Whether each SELECT the request issued was eligible for the replica."""
+        reads = []
+
+        def record(execute, sql, params, many, context):
+            if sql.lstrip().upper().startswith('SELECT'):
+                reads.append(replica_reads_active())
+            return execute(sql, params, many, context)
+
+        self.client.force_authenticate(user=user)
+        with connection.execute_wrapper(record):
+            response = getattr(self.client, method)(url, data, format='json')
+        self.assertLess(response.status_code, 400, response.data)
+        return reads
+
+    def test_listed_views_read_from_replica(self):
+        cache.clear()
+        cases = [
+            (self.user, '/api/v1/common/stadium-list/'),
+            (self.owner, reverse('owner-bron-list')),
+            (self.owner, reverse('owner-stadium-statistic')),
+            (self.admin, reverse('status-count')),
+        ]
+        for user, url in cases:
+            with self.subTest(url=url):
+                reads = self.replica_reads(user, 'get', url)
+                self.assertTrue(reads)
+                self.assertTrue(all(reads))
+        self.assertFalse(replica_reads_active())
+
+    def test_listed_views_skip_atomic_requests(self):
+        for name in ('owner-bron-list', 'owner-stadium-statistic', 'status-count'):
+            view = self.client.get(reverse(name)).resolver_match.func
+            self.assertIn('default', view._non_atomic_requests)
+
+    def test_other_views_stay_on_primary(self):
+        url = reverse('stadium-free-slots', kwargs={'pk': self.stadium.pk})
+        self.assertFalse(any(self.replica_reads(self.user, 'get', url)))
+
+    def test_writer_is_pinned_to_primary(self):
+        start = timezone.now().replace(minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)
+        self.replica_reads(self.user, 'post', reverse('bron-create'), {
+            'stadium': self.stadium.pk,
+            'start_time': start.isoformat(),
+            'end_time': (start + datetime.timedelta(hours=1)).isoformat(),
+            'is_team': False,
+        })
+        self.assertFalse(any(self.replica_reads(self.user, 'get', reverse('stadium-free-slots', kwargs={
+            'pk': self.stadium.pk}))))
+        self.assertFalse(any(self.replica_reads(self.user, 'get', '/api/v1/common/stadium-list/')))
+        self.assertTrue(all(self.replica_reads(self.owner, 'get', reverse('owner-bron-list'))))
+
+        pin_to_primary(self.owner)
+        self.assertFalse(any(self.replica_reads(self.owner, 'get', reverse('owner-bron-list'))))
+
+    async def test_writer_is_pinned_under_asgi(self):
+        start = timezone.now().replace(minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.user).access_token))()
+        response = await self.async_client.post(reverse('bron-create'), {
+            'stadium': self.stadium.pk,
+            'start_time': start.isoformat(),
+            'end_time': (start + datetime.timedelta(hours=1)).isoformat(),
+            'is_team': False,
+        }, content_type='application/json', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(await sync_to_async(is_pinned)(self.user))
+        self.assertFalse(await sync_to_async(is_pinned)(self.owner))
+
+    def test_recently_changed_stadium_list_is_built_on_primary(self):
+        cache.clear()
+        self.assertTrue(all(self.replica_reads(self.user, 'get', '/api/v1/common/stadium-list/')))
+        invalidate_stadium_list()
+        self.assertFalse(any(self.replica_reads(self.user, 'get', '/api/v1/common/stadium-list/')))
@@ -0,0 +1,127 @@
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnList
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from apps.common.models import Stadium, Bron
+from core.compression import COMPRESSORS, accepted_encodings, negotiate_encoding
+from core.renderers import FastJSONRenderer
+import datetime
+import gzip
+import json
+import unittest
+from unittest import mock
+import uuid
+from decimal import Decimal
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+User = get_user_model()
+TASHKENT = datetime.timezone(datetime.timedelta(hours=5))
+
+
+class FastJSONRendererTest(APITestCase):
+    def assertRendersLikeDRF(self, data, media_type=None):
+        self.assertEqual(FastJSONRenderer().render(data, media_type), JSONRenderer().render(data, media_type))
+
+    def test_output_matches_drf(self):
+        self.assertRendersLikeDRF({
+            'price_hour': Decimal('13000.50'),
+            'start_time': datetime.datetime(2026, 10, 17, 9, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'local_time': datetime.datetime(2026, 10, 17, 14, 30, tzinfo=TASHKENT),
+            'date': datetime.date(2026, 10, 17),
+            'duration': datetime.timedelta(hours=1),
+            'message': _('Such a stadium already exists.'),
+            'id': uuid.UUID(int=1),
+            1: 'Ташкент\u2028stadium\u2029',
+            'rows': ReturnList([{'is_paid': True, 'team_name': None, 'latitude': 41.3111}], serializer=None),
+        })
+        self.assertRendersLikeDRF(None)
+        self.assertRendersLikeDRF({'indented': [1, 2]}, 'application/json; indent=4')
+
+    def test_api_payloads_match_drf(self):
+        owner = User.objects.create_user(phone_number='+998911111111', password='password01', role='owner')
+        stadium = Stadium.objects.create(
+            owner=owner, name='Test Stadium', latitude='12.3459', longitude='-34.9876', price_hour='13000.00'
+        )
+        start = timezone.now().replace(minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)
+        Bron.objects.create(stadium=stadium, user=owner, start_time=start, end_time=start + datetime.timedelta(hours=1))
+
+        client = APIClient()
+        client.force_authenticate(user=owner)
+        for url in ('/api/v1/common/stadium-list/', reverse('owner-bron-list'), reverse('owner-stadium-statistic')):
+            response = client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+
+@override_settings(API_COMPRESSION_MIN_SIZE=200)
+class CompressionMiddlewareTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(phone_number='+998911111111', password='password01', role='owner')
+        for n in range(5):
+            Stadium.objects.create(
+                owner=self.owner, name=f'Stadium {n}', latitude='12.3459', longitude='-34.9876', price_hour='13000.00'
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+        self.url = '/api/v1/common/stadium-list/'
+        self.token = str(RefreshToken.for_user(self.owner).access_token)
+
+    def test_negotiation(self):
+        self.assertEqual(accepted_encodings('gzip;q=0.5, br , identity;q=0'), {'gzip': 0.5, 'br': 1.0, 'identity': 0.0})
+        self.assertEqual(negotiate_encoding('gzip, deflate'), 'gzip')
+        self.assertIsNone(negotiate_encoding('gzip;q=0, deflate'))
+        self.assertIsNone(negotiate_encoding(''))
+        self.assertEqual(negotiate_encoding('*'), 'br' if brotli else 'gzip')
+        with mock.patch.dict(COMPRESSORS, {'br': bytes}):
+            self.assertEqual(negotiate_encoding('gzip, br'), 'br')
+            self.assertEqual(negotiate_encoding('gzip;q=1, br;q=0.1'), 'gzip')
+            self.assertEqual(negotiate_encoding('br;q=0.1, *;q=0.5'), 'gzip')
+            self.assertEqual(negotiate_encoding('gzip;q=0.5, br'), 'br')
+
+    def test_large_json_is_gzipped(self):
+        plain = self.client.get(self.url)
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertLess(int(response['Content-Length']), len(plain.content))
+
+    async def test_async_responses_are_gzipped(self):
+        response = await self.async_client.get(reverse('async-stadium-list'), headers={
+            'Authorization': f'Bearer {self.token}', 'Accept-Encoding': 'gzip',
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))['results']), 5)
+
+    def test_compressed_etag_still_validates(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(API_COMPRESSION_MIN_SIZE=100000)
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
+
+    @unittest.skipIf(brotli is None, "brotli is not installed")
+    def test_brotli_is_preferred(self):
+        plain = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), plain.content)
@@ -0,0 +1,125 @@
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.common.models import Stadium, Bron
+from django.urls import reverse
+from django.utils import timezone
+import datetime
+from unittest import mock
+
+User = get_user_model()
+
+
+class StadiumFreeSlotsAPIViewTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(phone_number='+998911111111', password='password01', role='user')
+        self.owner = User.objects.create_user(phone_number='+998922222222', password='password02', role='owner')
+        self.stadium = Stadium.objects.create(
+            owner=self.owner,
+            name='Test Stadium',
+            latitude='12.3459',
+            longitude='-34.9876',
+            price_hour='13000.00'
+        )
+        self.day = timezone.localdate() + datetime.timedelta(days=1)
+        self.day_start = timezone.make_aware(datetime.datetime.combine(self.day, datetime.time.min))
+
+        self.client = APIClient()
+        self.url = reverse('stadium-free-slots', kwargs={'pk': self.stadium.pk})
+
+    def book(self, start_hour, end_hour):
+        return Bron.objects.create(
+            stadium=self.stadium,
+            user=self.user,
+            start_time=self.day_start + datetime.timedelta(hours=start_hour),
+            end_time=self.day_start + datetime.timedelta(hours=end_hour),
+        )
+
+    def slot_hours(self, response):
+        return [datetime.datetime.fromisoformat(slot['start_time']).hour for slot in response.data['slots']]
+
+    def test_free_slots_skip_booked_hours(self):
+        self.book(10, 12)
+        self.book(11, 13)
+        self.book(15.5, 16.5)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {'from': self.day.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        hours = self.slot_hours(response)
+        self.assertEqual(len(hours), 19)
+        for busy_hour in (10, 11, 12, 15, 16):
+            self.assertNotIn(busy_hour, hours)
+        self.assertIn(13, hours)
+        self.assertIn(17, hours)
+
+    def test_free_slots_over_several_days(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {
+            'from': self.day.isoformat(),
+            'to': (self.day + datetime.timedelta(days=2)).isoformat(),
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['slots']), 72)
+
+    def test_free_slots_are_cached_until_a_bron_changes(self):
+        self.client.force_authenticate(user=self.user)
+        params = {'from': self.day.isoformat()}
+        self.client.get(self.url, params)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params)
+        self.assertFalse([query for query in queries if 'common_bron' in query['sql']])
+        self.assertEqual(len(response.data['slots']), 24)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book(9, 10)
+        response = self.client.get(self.url, params)
+        self.assertEqual(len(response.data['slots']), 23)
+        self.assertNotIn(9, self.slot_hours(response))
+
+    def test_free_slots_start_at_the_next_full_hour(self):
+        self.client.force_authenticate(user=self.user)
+        now = timezone.localtime().replace(hour=9, minute=30, second=0, microsecond=0)
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            response = self.client.get(self.url, {'from': now.date().isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.slot_hours(response), list(range(10, 24)))
+
+        with mock.patch('django.utils.timezone.now', return_value=now + datetime.timedelta(hours=2)):
+            response = self.client.get(self.url, {'from': now.date().isoformat()})
+        self.assertEqual(self.slot_hours(response), list(range(12, 24)))
+
+    def test_free_slots_reject_past_dates(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {'from': (timezone.localdate() - datetime.timedelta(days=1)).isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_free_slots_invalid_range(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {
+            'from': self.day.isoformat(),
+            'to': (self.day - datetime.timedelta(days=1)).isoformat(),
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(self.url, {
+            'from': self.day.isoformat(),
+            'to': (self.day + datetime.timedelta(days=60)).isoformat(),
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_free_slots_inactive_stadium(self):
+        self.stadium.is_active = False
+        self.stadium.save()
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_free_slots_unauthenticated(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,172 @@
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import SkipFile
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+from PIL import Image
+from apps.common import tasks
+from apps.common.models import Stadium
+from apps.common.uploads import ImageUploadHandler
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+User = get_user_model()
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_upload(name='field.png', size=(2000, 1000)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (20, 120, 40)).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class StadiumImageVariantsTest(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(phone_number='+998911111111', password='password01', role='owner')
+        self.user = User.objects.create_user(phone_number='+998922222222', password='password02', role='user')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.stadium = Stadium.objects.create(
+                owner=self.owner, name='Test Stadium', latitude='12.3459', longitude='-34.9876',
+                price_hour='13000.00', image=image_upload()
+            )
+        self.stadium.refresh_from_db()
+        self.client = APIClient()
+
+    def test_variants_are_generated(self):
+        variants = self.stadium.image_variants
+        self.assertEqual(variants['source'], self.stadium.image.name)
+        for variant, bound in (('thumb', 320), ('medium', 960)):
+            for extension, format_name in (('webp', 'WEBP'), ('jpeg', 'JPEG')):
+                with default_storage.open(variants[variant][extension]) as file:
+                    image = Image.open(file)
+                    self.assertEqual(image.format, format_name)
+                    self.assertEqual(image.size, (bound, bound // 2))
+
+    def test_list_and_detail_expose_variant_urls(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/v1/common/stadium-list/')
+        variants = response.data['results'][0]['image_variants']
+        self.assertTrue(variants['thumb']['webp'].startswith('http://testserver/media/stadium_image/variants/'))
+        self.assertTrue(variants['medium']['jpeg'].endswith('_medium.jpeg'))
+
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.get(reverse('stadium-detail', kwargs={'pk': self.stadium.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['image_variants'], variants)
+
+    def test_replacing_image_regenerates_variants(self):
+        old_files = [name for variant in ('thumb', 'medium') for name in self.stadium.image_variants[variant].values()]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.stadium.image = image_upload('other.png', (600, 600))
+            self.stadium.save()
+        self.stadium.refresh_from_db()
+        self.assertEqual(self.stadium.image_variants['source'], self.stadium.image.name)
+        self.assertFalse(any(default_storage.exists(name) for name in old_files))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.stadium.image = None
+            self.stadium.save()
+        self.stadium.refresh_from_db()
+        self.assertEqual(self.stadium.image_variants, {})
+
+    def test_storage_error_keeps_the_original(self):
+        Stadium.objects.filter(pk=self.stadium.pk).update(image_variants={})
+        with mock.patch('django.core.files.storage.FileSystemStorage.save', side_effect=OSError(28, 'No space left')):
+            with self.assertRaises(OSError):
+                tasks.generate_stadium_image_variants(self.stadium.pk)
+        self.stadium.refresh_from_db()
+        self.assertTrue(default_storage.exists(self.stadium.image.name))
+        self.assertEqual(self.stadium.image_variants, {})
+
+    def test_variants_pending(self):
+        Stadium.objects.filter(pk=self.stadium.pk).update(image_variants={})
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/v1/common/stadium-list/')
+        self.assertEqual(response.data['results'][0]['image_variants'], {})
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, STADIUM_IMAGE_MAX_SIZE=64 * 1024)
+class StadiumImageUploadTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(phone_number='+998911111111', password='password01', role='owner')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def upload(self, image):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/v1/common/stadium/', {
+                'name': 'Upload Stadium', 'latitude': '12.3459', 'longitude': '-34.9876',
+                'price_hour': '13000.00', 'image': image
+            }, format='multipart')
+
+    def test_upload_is_stored_and_resized(self):
+        response = self.upload(image_upload(size=(400, 200)))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        stadium = Stadium.objects.get(pk=response.data['id'])
+        self.assertTrue(default_storage.exists(stadium.image.name))
+        self.assertEqual(stadium.image_variants['source'], stadium.image.name)
+
+    def test_oversized_upload_is_rejected(self):
+        noise = Image.frombytes('RGB', (200, 200), os.urandom(200 * 200 * 3))
+        buffer = io.BytesIO()
+        noise.save(buffer, 'PNG')
+        response = self.upload(SimpleUploadedFile('big.png', buffer.getvalue(), content_type='image/png'))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('larger than 64', str(response.data['image'][0]))
+        self.assertFalse(Stadium.objects.exists())
+
+    def test_non_image_upload_is_rejected(self):
+        for content in (b'<html></html>' * 10, b'GIF'):
+            response = self.upload(SimpleUploadedFile('fake.png', content, content_type='image/png'))
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('image', response.data)
+        self.assertFalse(Stadium.objects.exists())
+
+    def test_undecodable_image_is_dropped_after_commit(self):
+        response = self.upload(SimpleUploadedFile('broken.png', b'\x89PNG\r\n\x1a\n' + b'0' * 100))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        stadium = Stadium.objects.get(pk=response.data['id'])
+        self.assertFalse(stadium.image)
+        self.assertEqual(stadium.image_variants, {})
+
+    def test_enqueue_failure_does_not_fail_the_saved_stadium(self):
+        delay = mock.patch.object(tasks.generate_stadium_image_variants, 'delay', side_effect=ConnectionError)
+        with delay, self.assertLogs('apps.common.signals', 'ERROR'):
+            response = self.upload(image_upload(size=(400, 200)))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        stadium = Stadium.objects.get(pk=response.data['id'])
+        self.assertTrue(stadium.image)
+        self.assertEqual(stadium.image_variants, {})
+
+    def test_handler_streams_to_disk_and_stops_early(self):
+        handler = ImageUploadHandler(RequestFactory().post('/'))
+        handler.new_file('image', 'field.png', 'image/png', None)
+        content = image_upload(size=(100, 100)).read()
+        handler.receive_data_chunk(content, 0)
+        uploaded = handler.file_complete(len(content))
+        self.assertTrue(os.path.exists(uploaded.temporary_file_path()))
+        uploaded.close()
+
+        handler.new_file('image', 'field.png', 'image/png', None)
+        handler.receive_data_chunk(content, 0)
+        path = handler.file.temporary_file_path()
+        with self.assertRaises(SkipFile):
+            handler.receive_data_chunk(b'0' * 64 * 1024, len(content))
+        self.assertFalse(os.path.exists(path))
+        self.assertIn('image', handler.request.upload_errors)
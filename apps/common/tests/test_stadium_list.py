@@ -1,7 +1,9 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
-from apps.common.models import Stadium
+from apps.common.models import Stadium, Bron
+from django.utils import timezone
+import datetime
 
 User = get_user_model()
 
@@ -60,6 +62,40 @@ class StadiumListTests(APITestCase):
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['name'], 'Searchable Stadium')
 
+    def test_search_stadium_by_manager(self):
+        self.client.force_authenticate(user=self.owner_user)
+        manager = User.objects.create_user(phone_number='+998933333333', password='password03',
+                                           role='manager', full_name='Aziz Karimov')
+        Stadium.objects.create(owner=self.owner_user, name='Managed Stadium', manager=manager, **self.stadium_data)
+        Stadium.objects.create(owner=self.owner_user, name='Other Stadium', **self.stadium_data)
+
+        for term in ('karimov', '933333'):
+            response = self.client.get('/api/v1/common/stadium-list/', {'search': term})
+            self.assertEqual([item['name'] for item in response.data['results']], ['Managed Stadium'])
+
+        manager.full_name = 'Bobur Aliyev'
+        manager.save()
+        response = self.client.get('/api/v1/common/stadium-list/', {'search': 'karimov'})
+        self.assertEqual(response.data['results'], [])
+        response = self.client.get('/api/v1/common/stadium-list/', {'search': 'aliyev'})
+        self.assertEqual(len(response.data['results']), 1)
+
+        manager.delete()
+        response = self.client.get('/api/v1/common/stadium-list/', {'search': 'aliyev'})
+        self.assertEqual(response.data['results'], [])
+
+    def test_search_ranks_name_matches_first(self):
+        self.client.force_authenticate(user=self.owner_user)
+        Stadium.objects.create(owner=self.owner_user, name='Old Arena', **self.stadium_data)
+        Stadium.objects.create(owner=self.owner_user, name='Arena Park', **self.stadium_data)
+        Stadium.objects.create(owner=self.owner_user, name='Park', **self.stadium_data)
+
+        response = self.client.get('/api/v1/common/stadium-list/', {'search': 'arena'})
+        self.assertEqual([item['name'] for item in response.data['results']], ['Arena Park', 'Old Arena'])
+
+        response = self.client.get('/api/v1/common/stadium-list/', {'search': 'arena', 'ordering': 'name'})
+        self.assertEqual([item['name'] for item in response.data['results']], ['Arena Park', 'Old Arena'])
+
     def test_filter_stadium_by_price_hour(self):
         self.client.force_authenticate(user=self.owner_user)
         Stadium.objects.create(owner=self.owner_user, name='Stadium 1', **self.stadium_data)
@@ -111,4 +147,41 @@ class StadiumListTests(APITestCase):
         stadium_data = response.data['results'][0]
         self.assertIn('manager', stadium_data)
         self.assertIn('id', stadium_data['manager'])
-        self.assertIn('phone_number', stadium_data['manager'])
\ No newline at end of file
+        self.assertIn('phone_number', stadium_data['manager'])
+
+    def test_filter_stadiums_available_between(self):
+        self.client.force_authenticate(user=self.owner_user)
+        busy = Stadium.objects.create(owner=self.owner_user, name='Busy Stadium', **self.stadium_data)
+        Stadium.objects.create(owner=self.owner_user, name='Free Stadium', **self.stadium_data)
+        Stadium.objects.create(owner=self.owner_user, name='Closed Stadium', is_active=False, **self.stadium_data)
+        start_time = timezone.now().replace(minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)
+        Bron.objects.create(stadium=busy, user=self.other_user, start_time=start_time,
+                            end_time=start_time + datetime.timedelta(hours=2))
+
+        response = self.client.get('/api/v1/common/stadium-list/', {
+            'available_from': (start_time + datetime.timedelta(hours=1)).isoformat(),
+            'available_to': (start_time + datetime.timedelta(hours=3)).isoformat(),
+            'ordering': 'name',
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([stadium['name'] for stadium in response.data['results']], ['Free Stadium'])
+
+        response = self.client.get('/api/v1/common/stadium-list/', {
+            'available_from': (start_time + datetime.timedelta(hours=2)).isoformat(),
+            'available_to': (start_time + datetime.timedelta(hours=3)).isoformat(),
+            'search': 'Busy',
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([stadium['name'] for stadium in response.data['results']], ['Busy Stadium'])
+
+    def test_filter_stadiums_available_invalid_range(self):
+        self.client.force_authenticate(user=self.owner_user)
+        now = timezone.now()
+        response = self.client.get('/api/v1/common/stadium-list/', {
+            'available_from': now.isoformat(),
+            'available_to': (now - datetime.timedelta(hours=1)).isoformat(),
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get('/api/v1/common/stadium-list/', {'available_from': now.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
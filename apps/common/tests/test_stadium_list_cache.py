@@ -0,0 +1,93 @@
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from apps.common.models import Stadium, Bron
+from apps.common.caching import stadium_list_key
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+import datetime
+
+User = get_user_model()
+
+
+class StadiumListCacheTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(phone_number='+998911111111', password='password01', role='owner')
+        self.manager = User.objects.create_user(
+            phone_number='+998922222222', password='password02', role='manager', full_name='Old Name'
+        )
+        self.user = User.objects.create_user(phone_number='+998933333333', password='password03', role='user')
+        self.stadium = Stadium.objects.create(
+            owner=self.owner, manager=self.manager, name='Cached Stadium',
+            latitude='12.3459', longitude='-34.9876', price_hour='13000.00'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/v1/common/stadium-list/'
+
+    def assertServedFromCache(self, params=None):
+        with self.assertNumQueries(0):
+            return self.client.get(self.url, params)
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        second = self.assertServedFromCache()
+        self.assertEqual(first.data, second.data)
+
+    def test_query_string_is_normalized(self):
+        factory = APIRequestFactory()
+        first = Request(factory.get(self.url, {'search': 'x', 'ordering': 'name', 'name': ''}))
+        second = Request(factory.get(f'{self.url}?ordering=name&search=x'))
+        third = Request(factory.get(self.url, {'search': 'y', 'ordering': 'name'}))
+        self.assertEqual(stadium_list_key(first), stadium_list_key(second))
+        self.assertNotEqual(stadium_list_key(first), stadium_list_key(third))
+
+    def test_stadium_save_and_delete_invalidate(self):
+        self.client.get(self.url)
+        self.stadium.name = 'Renamed Stadium'
+        self.stadium.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'][0]['name'], 'Renamed Stadium')
+
+        self.stadium.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 0)
+
+    def test_manager_contact_change_invalidates(self):
+        self.client.get(self.url)
+        self.manager.full_name = 'New Name'
+        self.manager.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'][0]['manager']['full_name'], 'New Name')
+
+    def test_unrelated_user_change_keeps_cache(self):
+        self.client.get(self.url)
+        self.manager.role = 'manager'
+        self.manager.save(update_fields=['role'])
+        self.user.full_name = 'Someone'
+        self.user.save()
+        self.assertServedFromCache()
+
+    def test_booking_invalidates_availability_pages(self):
+        start = timezone.now().replace(minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)
+        window = {'available_from': start.isoformat(), 'available_to': (start + datetime.timedelta(hours=1)).isoformat()}
+        self.assertEqual(self.client.get(self.url, window).data['count'], 1)
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('bron-create'), {
+                'stadium': self.stadium.id, 'start_time': start.isoformat(),
+                'end_time': (start + datetime.timedelta(hours=1)).isoformat(), 'is_team': False,
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.client.get(self.url, window).data['count'], 0)
+        self.assertServedFromCache()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Bron.objects.get().delete()
+        self.assertEqual(self.client.get(self.url, window).data['count'], 1)
@@ -0,0 +1,67 @@
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.common.models import Stadium
+from apps.common.geo import geohash_encode, covering_cells, haversine_km
+from django.urls import reverse
+
+User = get_user_model()
+
+
+class StadiumNearbyAPIViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(phone_number='+998911111111', password='password01', role='user')
+        self.owner = User.objects.create_user(phone_number='+998922222222', password='password02', role='owner')
+        self.center = {'lat': '41.311100', 'lng': '69.279700'}
+        self.create_stadium('Close Stadium', '41.320000', '69.279700')
+        self.create_stadium('Further Stadium', '41.340000', '69.300000')
+        self.create_stadium('Samarkand Stadium', '39.654200', '66.959700')
+        self.create_stadium('Closed Stadium', '41.312000', '69.280000', is_active=False)
+
+        self.client = APIClient()
+        self.url = reverse('stadium-nearby')
+
+    def create_stadium(self, name, latitude, longitude, **kwargs):
+        return Stadium.objects.create(
+            owner=self.owner, name=name, latitude=latitude, longitude=longitude, price_hour='13000.00', **kwargs
+        )
+
+    def test_geohash_is_kept_in_sync(self):
+        stadium = Stadium.objects.get(name='Close Stadium')
+        self.assertEqual(stadium.geohash, geohash_encode(stadium.latitude, stadium.longitude))
+        stadium.latitude = '39.654200'
+        stadium.save(update_fields=['latitude'])
+        stadium.refresh_from_db()
+        self.assertEqual(stadium.geohash, geohash_encode('39.654200', '69.279700'))
+
+    def test_covering_cells_contain_every_point_in_radius(self):
+        cells = covering_cells(41.3111, 69.2797, 5)
+        for latitude, longitude in ((41.3561, 69.2797), (41.3111, 69.3395), (41.2661, 69.2797), (41.3111, 69.2199)):
+            self.assertLessEqual(haversine_km(41.3111, 69.2797, latitude, longitude), 5.01)
+            self.assertTrue(any(geohash_encode(latitude, longitude).startswith(cell) for cell in cells))
+
+    def test_nearby_stadiums_sorted_by_distance(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {**self.center, 'radius': 10})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([stadium['name'] for stadium in response.data], ['Close Stadium', 'Further Stadium'])
+        self.assertAlmostEqual(response.data[0]['distance_km'], 0.99, places=1)
+
+    def test_nearby_stadiums_radius_and_limit(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {**self.center, 'radius': 2})
+        self.assertEqual([stadium['name'] for stadium in response.data], ['Close Stadium'])
+
+        response = self.client.get(self.url, {**self.center, 'radius': 10, 'limit': 1})
+        self.assertEqual([stadium['name'] for stadium in response.data], ['Close Stadium'])
+
+    def test_nearby_stadiums_invalid_params(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {'lat': '91', 'lng': '69.2797'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {**self.center, 'radius': 500})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_nearby_stadiums_unauthenticated(self):
+        response = self.client.get(self.url, self.center)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -127,4 +127,86 @@ class OwnerStadiumStatsViewTest(APITestCase):
 
     def test_stadium_stats_unauthenticated(self):
         response = self.client.get(self.url)
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def stats_by_name(self, response):
+        return {item['name']: item for item in response.data['results']}
+
+    def test_stadium_stats_totals_come_from_rollup(self):
+        self.client.force_authenticate(user=self.owner_user)
+        stats = self.stats_by_name(self.client.get(self.url))
+        self.assertEqual(stats['Stadium A']['total_bron_count'], 2)
+        self.assertEqual(stats['Stadium A']['paid_hours'], '1.00')
+        self.assertEqual(stats['Stadium A']['total_income'], '13000.00')
+        self.assertEqual(stats['Stadium B']['total_income'], '15000.00')
+
+    def test_stadium_stats_count_booking_duration(self):
+        start_time = timezone.now() + datetime.timedelta(hours=6)
+        Bron.objects.create(
+            stadium=self.stadium2,
+            user=self.regular_user,
+            start_time=start_time,
+            end_time=start_time + datetime.timedelta(hours=3),
+            is_paid=True
+        )
+        self.client.force_authenticate(user=self.owner_user)
+        stats = self.stats_by_name(self.client.get(self.url))
+        self.assertEqual(stats['Stadium B']['paid_hours'], '4.00')
+        self.assertEqual(stats['Stadium B']['total_income'], '60000.00')
+
+    def test_stadium_stats_follow_bron_update(self):
+        manager = User.objects.create_user(phone_number='+998933333333', password='password03', role='manager')
+        unpaid = Bron.objects.get(stadium=self.stadium1, is_paid=False)
+        self.client.force_authenticate(user=manager)
+        response = self.client.patch(reverse('bron-update', kwargs={'pk': unpaid.pk}), {'is_paid': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(user=self.owner_user)
+        stats = self.stats_by_name(self.client.get(self.url))
+        self.assertEqual(stats['Stadium A']['paid_hours'], '2.00')
+        self.assertEqual(stats['Stadium A']['total_income'], '26000.00')
+
+        unpaid.refresh_from_db()
+        unpaid.delete()
+        stats = self.stats_by_name(self.client.get(self.url))
+        self.assertEqual(stats['Stadium A']['total_bron_count'], 1)
+        self.assertEqual(stats['Stadium A']['total_income'], '13000.00')
+
+    def test_stadium_stats_keep_the_booked_price(self):
+        paid = Bron.objects.get(stadium=self.stadium1, is_paid=True)
+        self.stadium1.price_hour = decimal.Decimal('20000.00')
+        self.stadium1.save()
+        paid.is_paid = False
+        paid.save()
+
+        self.client.force_authenticate(user=self.owner_user)
+        stats = self.stats_by_name(self.client.get(self.url))
+        self.assertEqual(stats['Stadium A']['paid_hours'], '0.00')
+        self.assertEqual(stats['Stadium A']['total_income'], '0.00')
+
+        paid = Bron.objects.get(pk=paid.pk)
+        paid.is_paid = True
+        # The row and its rollup; the stadium is not loaded.
+        with self.assertNumQueries(2):
+            paid.save()
+        stats = self.stats_by_name(self.client.get(self.url))
+        self.assertEqual(stats['Stadium A']['total_income'], '13000.00')
+
+    def test_stadium_stats_date_bounds(self):
+        next_week = timezone.now() + datetime.timedelta(days=7)
+        Bron.objects.create(
+            stadium=self.stadium1,
+            user=self.regular_user,
+            start_time=next_week,
+            end_time=next_week + datetime.timedelta(hours=1),
+            is_paid=True
+        )
+        self.client.force_authenticate(user=self.owner_user)
+        day = timezone.localdate(next_week).isoformat()
+        stats = self.stats_by_name(self.client.get(self.url, {'from': day, 'to': day}))
+        self.assertEqual(stats['Stadium A']['total_bron_count'], 1)
+        self.assertEqual(stats['Stadium B']['total_bron_count'], 0)
+        self.assertEqual(stats['Stadium B']['total_income'], '0.00')
+
+        response = self.client.get(self.url, {'from': day, 'to': '2000-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
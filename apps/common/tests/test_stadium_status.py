@@ -1,7 +1,10 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
-from apps.common.models import Stadium
+from apps.common.models import Bron, Stadium, StadiumCounter
+from django.db.models.signals import post_init
+from django.core.management import call_command
+from io import StringIO
 from rest_framework.permissions import IsAdminUser
 from django.urls import reverse
 
@@ -73,4 +76,57 @@ class StadiumStatsCountAPIViewTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['total_stadiums'], 0)
         self.assertEqual(response.data['active_stadiums'], 0)
-        self.assertEqual(response.data['inactive_stadiums'], 0)
\ No newline at end of file
+        self.assertEqual(response.data['inactive_stadiums'], 0)
+
+    def test_stadium_stats_follow_is_active_changes(self):
+        stadium = Stadium.objects.get(name='Active Stadium 1')
+        stadium.is_active = False
+        stadium.save()
+        stadium.save()
+        Stadium.objects.get(name='Active Stadium 2').delete()
+
+        self.client.force_authenticate(user=self.admin_user)
+        with self.assertNumQueries(1):  # the counter row
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['total_stadiums'], 2)
+        self.assertEqual(response.data['active_stadiums'], 0)
+        self.assertEqual(response.data['inactive_stadiums'], 2)
+
+    def test_unsaved_is_active_change_does_not_skew_delete(self):
+        stadium = Stadium.objects.get(name='Active Stadium 1')
+        stadium.is_active = False
+        stadium.delete()
+        counter = StadiumCounter.get()
+        self.assertEqual((counter.total, counter.active, counter.inactive), (2, 1, 1))
+
+    def test_loaded_values_come_from_the_database_only(self):
+        for model in (Stadium, Bron, User):
+            self.assertFalse(post_init.has_listeners(model))
+
+        stadium = Stadium.objects.only('name').get(name='Active Stadium 1')
+        self.assertEqual(stadium.loaded_values(['is_active']), {})
+        stadium.refresh_from_db(fields=['is_active'])
+        self.assertEqual(stadium.loaded_values(['is_active']), {'is_active': True})
+        stadium.is_active = False
+        stadium.save(update_fields=['is_active'])
+        self.assertEqual(stadium.loaded_values(['is_active']), {'is_active': False})
+        counter = StadiumCounter.get()
+        self.assertEqual((counter.active, counter.inactive), (1, 2))
+
+    def test_reconcile_command_fixes_drift(self):
+        Stadium.objects.filter(name='Inactive Stadium').update(is_active=True)
+        StadiumCounter.objects.update(total=99)
+
+        out = StringIO()
+        call_command('reconcile_stadium_counters', stdout=out)
+        self.assertIn('Fixed drift', out.getvalue())
+
+        counter = StadiumCounter.get()
+        self.assertEqual((counter.total, counter.active, counter.inactive), (3, 3, 0))
+
+    def test_missing_counter_row_is_rebuilt(self):
+        StadiumCounter.objects.all().delete()
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['total_stadiums'], 3)
+        self.assertEqual(response.data['inactive_stadiums'], 1)
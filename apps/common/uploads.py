@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+from django.template.defaultfilters import filesizeformat
+from django.utils.translation import gettext as _, gettext_lazy
+
+# Leading bytes of the accepted image formats; WebP also needs b'WEBP' at offset 8.
+IMAGE_SIGNATURES = {
+    'jpeg': b'\xff\xd8\xff',
+    'png': b'\x89PNG\r\n\x1a\n',
+    'webp': b'RIFF',
+}
+SIGNATURE_LENGTH = 12
+INVALID_FORMAT = gettext_lazy("Upload a JPEG, PNG or WebP image.")
+
+
+def image_format(header):
+    for name, signature in IMAGE_SIGNATURES.items():
+        if header.startswith(signature):
+            if name == 'webp' and header[8:12] != b'WEBP':
+                continue
+            return name
+    return None
+
+
+class ImageUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams uploaded files to a temporary file on disk, checking the size and
+    the image signature as chunks arrive. A rejected file is dropped at the
+    first offending chunk, and the reason is left in request.upload_errors
+    for the serializer to report.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        request.upload_errors = {}
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.header = b''
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.STADIUM_IMAGE_MAX_SIZE:
+            self.reject(_("The image must not be larger than %(size)s.") % {
+                'size': filesizeformat(settings.STADIUM_IMAGE_MAX_SIZE)
+            })
+        if len(self.header) < SIGNATURE_LENGTH:
+            self.header += raw_data[:SIGNATURE_LENGTH - len(self.header)]
+            if len(self.header) == SIGNATURE_LENGTH and image_format(self.header) is None:
+                self.reject(INVALID_FORMAT)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        # Files shorter than a signature are only known to be invalid here.
+        if image_format(self.header) is None:
+            self.discard(INVALID_FORMAT)
+            return None
+        return super().file_complete(file_size)
+
+    def discard(self, message):
+        self.request.upload_errors[self.field_name] = str(message)
+        self.upload_interrupted()
+
+    def reject(self, message):
+        self.discard(message)
+        raise SkipFile()
+
+
+class ImageUploadMixin:
+    """Makes multipart requests of a view go through ImageUploadHandler."""
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers = [ImageUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
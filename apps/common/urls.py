@@ -7,10 +7,18 @@ router.register(r'stadium', views.StadiumViewSet, basename='stadium') #
 
 urlpatterns = [
     path("stadium-list/", views.StadiumListAPIView.as_view(), name="stadium-list"), #
+    path("stadium-nearby/", views.StadiumNearbyAPIView.as_view(), name="stadium-nearby"),
     path('stadium-status/', views.StadiumStatsCountAPIView.as_view(), name="status-count"), #
+    path('stadium-free-slots/<int:pk>/', views.StadiumFreeSlotsAPIView.as_view(), name="stadium-free-slots"),
     path('bron-create/', views.BronCreateAPIView.as_view(), name="bron-create"), #
+    path('bron-bulk-create/', views.BronBulkCreateAPIView.as_view(), name="bron-bulk-create"),
     path('bron-update/<int:pk>/', views.BronUpdateAPIView.as_view(), name="bron-update"), #
     path('bron-list/', views.OwnerBronListAPIView.as_view(), name="owner-bron-list"), #
     path('stadium-statistic/', views.OwnerStadiumStatsView.as_view(), name='owner-stadium-statistic'),
+    path("async/stadium-list/", views.AsyncStadiumListAPIView.as_view(), name="async-stadium-list"),
+    path("async/stadium-status/", views.AsyncStadiumStatsCountAPIView.as_view(), name="async-status-count"),
+    path("async/bron-list/", views.AsyncOwnerBronListAPIView.as_view(), name="async-owner-bron-list"),
+    path("async/stadium-statistic/", views.AsyncOwnerStadiumStatsView.as_view(),
+         name="async-owner-stadium-statistic"),
     path("", include(router.urls)),
 ]
@@ -5,10 +5,32 @@ from rest_framework.exceptions import PermissionDenied
 from . import serializers
 from apps.user.permissions import IsAdminUser, IsOwnerUser, IsManager
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Case, When, IntegerField, Sum, Q, F, ExpressionWrapper, DecimalField
+from django.db.models import Count, Max, Sum, Q
+from django.contrib.auth.models import AnonymousUser
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.views import View
+from asgiref.sync import sync_to_async
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from apps.user.authentication import ROLE_CLAIM_AUTHENTICATION, authenticate_async
+from core.db_router import ReplicaReadMixin
+from django.conf import settings
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+from . import geo
+from .caching import (
+    aget_stadium_list, aget_stadium_list_validators, get_free_slots, get_stadium_list, get_stadium_list_validators,
+    stadium_list_changed_within
+)
+from .conditional import conditional_response, make_etag, set_validators
+from .filters import StadiumAvailabilityFilter, StadiumSearchFilter
+from .pagination import AsyncLimitOffsetPagination, BronKeysetPagination, is_keyset_request
+from .slots import free_slots, slots_start
+from .uploads import ImageUploadMixin
 
 
-class StadiumViewSet(viewsets.ModelViewSet):
+class StadiumViewSet(ImageUploadMixin, viewsets.ModelViewSet):
     queryset = models.Stadium.objects.all()
     permission_classes = [IsAdminUser | IsOwnerUser]
 
@@ -28,86 +50,308 @@ class StadiumViewSet(viewsets.ModelViewSet):
         return models.Stadium.objects.filter(owner=user)
 
     def perform_destroy(self, instance):
-        if self.request.user.role == 'owner' and instance.owner != self.request.user:
+        if self.request.user.role == 'owner' and instance.owner_id != self.request.user.id:
             raise PermissionDenied("You do not have permission to delete!")
         instance.delete()
 
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
-        if request.user.role == 'owner' and instance.owner != request.user:
+        if request.user.role == 'owner' and instance.owner_id != request.user.id:
             raise PermissionDenied("You do not have permission to update!")
         return super().update(request, *args, **kwargs)
 
-class StadiumStatsCountAPIView(views.APIView):
+    def retrieve(self, request, *args, **kwargs):
+        stadiums = self.filter_queryset(self.get_queryset())
+        try:
+            modified = stadiums.filter(pk=kwargs['pk']).values_list('updated_at', flat=True).first()
+        except ValueError:
+            modified = None
+        if modified is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        # Image URLs are absolute and the admin serializer has more fields.
+        etag = make_etag(request.build_absolute_uri(), self.get_serializer_class().__name__, modified.isoformat())
+        last_modified = int(modified.timestamp())
+        not_modified = conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        return set_validators(super().retrieve(request, *args, **kwargs), etag, last_modified)
+
+class StadiumStatsCountAPIView(ReplicaReadMixin, views.APIView):
+    authentication_classes = ROLE_CLAIM_AUTHENTICATION
     permission_classes = [IsAdminUser]
+    # Two, plus three more when a missing counter row has to be recomputed.
+    query_budget = 5
 
     def get(self, request):
-        stats = models.Stadium.objects.aggregate(
-            total=Count('id'),
-            active=Count(Case(When(is_active=True, then=1), output_field=IntegerField())),
-            inactive=Count(Case(When(is_active=False, then=1), output_field=IntegerField()))
-        )
+        counter = models.StadiumCounter.get()
+
+        return Response(self.serialize(counter))
 
-        return Response({
-            "total_stadiums": stats['total'],
-            "active_stadiums": stats['active'],
-            "inactive_stadiums": stats['inactive']
-        })
+    def serialize(self, counter):
+        return {
+            "total_stadiums": counter.total,
+            "active_stadiums": counter.active,
+            "inactive_stadiums": counter.inactive
+        }
 
 
-class StadiumListAPIView(generics.ListAPIView):
-    queryset = models.Stadium.objects.filter(is_active=True).select_related('owner', 'manager').all()
+class StadiumListAPIView(ReplicaReadMixin, generics.ListAPIView):
+    queryset = models.Stadium.objects.filter(is_active=True).select_related('manager').order_by('name', 'id')
     serializer_class = serializers.StadiumListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # The conditional-GET validators, then the page count and rows.
+    query_budget = 4
 
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, StadiumAvailabilityFilter, StadiumSearchFilter, filters.OrderingFilter]
     filterset_fields = ['name', 'price_hour']
-    search_fields = ['name', 'price_hour', 'manager__full_name', 'manager__phone_number']
     ordering_fields = ['name']
 
+    def use_replica(self, request):
+        # A page computed from a lagging replica would be cached as current.
+        return super().use_replica(request) and not stadium_list_changed_within(settings.REPLICA_PIN_SECONDS)
+
+    def get_validators(self):
+        totals = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            modified=Max('updated_at'), count=Count('id')
+        )
+        return totals['modified'], totals['count']
+
+    async def aget_validators(self):
+        totals = await self.filter_queryset(self.get_queryset()).order_by().aaggregate(
+            modified=Max('updated_at'), count=Count('id')
+        )
+        return totals['modified'], totals['count']
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = get_stadium_list_validators(request, self.get_validators)
+        not_modified = conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        def compute():
+            return super(StadiumListAPIView, self).list(request, *args, **kwargs).data
+
+        return set_validators(Response(get_stadium_list(request, compute)), etag, last_modified)
+
+def geohash_prefix(cell):
+    low, high = geo.prefix_range(cell)
+    return Q(geohash__gte=low, geohash__lt=high) if high else Q(geohash__gte=low)
+
+
+class StadiumNearbyAPIView(views.APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = 2
+
+    def get(self, request):
+        query = serializers.StadiumNearbyQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        lat, lng, radius, limit = (query.validated_data[key] for key in ('lat', 'lng', 'radius', 'limit'))
+
+        min_lat, max_lat, min_lng, max_lng = geo.bounding_box(lat, lng, radius)
+        candidates = models.Stadium.objects.filter(
+            is_active=True, latitude__range=(min_lat, max_lat)
+        ).select_related('manager')
+        if min_lng >= -180 and max_lng <= 180:
+            candidates = candidates.filter(longitude__range=(min_lng, max_lng))
+        cells = geo.covering_cells(lat, lng, radius)
+        if cells:
+            candidates = candidates.filter(reduce(or_, (geohash_prefix(cell) for cell in cells)))
+
+        nearest = []
+        for stadium in candidates:
+            stadium.distance_km = round(geo.haversine_km(lat, lng, stadium.latitude, stadium.longitude), 3)
+            if stadium.distance_km <= radius:
+                nearest.append(stadium)
+        nearest.sort(key=lambda stadium: (stadium.distance_km, stadium.id))
+
+        serializer = serializers.StadiumNearbySerializer(nearest[:limit], many=True, context={'request': request})
+        return Response(serializer.data)
+
+class StadiumFreeSlotsAPIView(views.APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = 3
+
+    def get(self, request, pk):
+        stadium = get_object_or_404(models.Stadium, pk=pk, is_active=True)
+        params = {
+            key: request.query_params[param]
+            for key, param in (('date_from', 'from'), ('date_to', 'to'))
+            if param in request.query_params
+        }
+        query = serializers.FreeSlotsQuerySerializer(data=params)
+        query.is_valid(raise_exception=True)
+        date_from = query.validated_data['date_from']
+        date_to = query.validated_data['date_to']
+
+        def compute():
+            return {
+                "stadium": stadium.id,
+                "from": date_from.isoformat(),
+                "to": date_to.isoformat(),
+                "slots": [
+                    {"start_time": start.isoformat(), "end_time": end.isoformat()}
+                    for start, end in free_slots(stadium.id, date_from, date_to)
+                ]
+            }
+
+        # Keyed on the first reportable hour, so today's slots expire as hours pass.
+        return Response(get_free_slots(stadium.id, slots_start(date_from).isoformat(), date_to, compute))
+
 class BronCreateAPIView(generics.CreateAPIView):
     queryset = models.Bron.objects.all()
     serializer_class = serializers.BronCreateSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+class BronBulkCreateAPIView(generics.CreateAPIView):
+    queryset = models.Bron.objects.all()
+    serializer_class = serializers.BronBulkCreateSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
 class BronUpdateAPIView(generics.UpdateAPIView):
     queryset = models.Bron.objects.all()
     serializer_class = serializers.BronUpdateSerializer
+    authentication_classes = ROLE_CLAIM_AUTHENTICATION
     permission_classes = [IsManager]
     lookup_field = 'pk'
 
-class OwnerBronListAPIView(generics.ListAPIView):
+class OwnerBronListAPIView(ReplicaReadMixin, generics.ListAPIView):
     serializer_class = serializers.StadionBronSerializer
+    authentication_classes = ROLE_CLAIM_AUTHENTICATION
     permission_classes = [IsOwnerUser]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['stadium__name', 'start_time', 'end_time', 'is_paid']
     search_fields = ['stadium__name', ]
     ordering_fields = ['start_time', 'end_time']
     ordering = ['start_time']
+    query_budget = 3
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if is_keyset_request(self.request):
+                self._paginator = BronKeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
 
     def get_queryset(self):
         user = self.request.user
-        owner_stadium = models.Stadium.objects.filter(owner=user)
-        bron_list = models.Bron.objects.filter(stadium__in=owner_stadium)
+        bron_list = models.Bron.objects.filter(stadium__in=user.stadium_ids).select_related('stadium', 'team')
         return bron_list
 
 
-class OwnerStadiumStatsView(generics.ListAPIView):
+class OwnerStadiumStatsView(ReplicaReadMixin, generics.ListAPIView):
     serializer_class = serializers.StadiumStatsSerializer
+    authentication_classes = ROLE_CLAIM_AUTHENTICATION
     permission_classes = [IsOwnerUser]
+    query_budget = 3
 
     def get_queryset(self):
         user = self.request.user
+        params = {
+            key: self.request.query_params[param]
+            for key, param in (('date_from', 'from'), ('date_to', 'to'))
+            if param in self.request.query_params
+        }
+        query = serializers.StadiumStatsQuerySerializer(data=params)
+        query.is_valid(raise_exception=True)
+
+        period = Q()
+        if 'date_from' in query.validated_data:
+            period &= Q(daily_stats__date__gte=query.validated_data['date_from'])
+        if 'date_to' in query.validated_data:
+            period &= Q(daily_stats__date__lte=query.validated_data['date_to'])
+
         return (
-            models.Stadium.objects.filter(owner=user)
+            models.Stadium.objects.filter(owner_id=user.id)
             .annotate(
-                total_bron_count=Count('bron_stadium', distinct=True),
-                total_income=Sum(
-                    ExpressionWrapper(
-                        F('price_hour'),
-                        output_field=DecimalField()
-                    ),
-                    filter=Q(bron_stadium__is_paid=True)
-                )
+                total_bron_count=Sum('daily_stats__bookings', filter=period, default=0),
+                paid_hours=Sum('daily_stats__paid_hours', filter=period, default=Decimal(0)),
+                total_income=Sum('daily_stats__income', filter=period, default=Decimal(0)),
             )
-        )
\ No newline at end of file
+            .order_by('id')
+        )
+
+
+class AsyncReadAPIView(View):
+    """
+    Async front for a read-only DRF view. Policy checks (permissions,
+    throttles, replica routing), filtering, pagination and serialization
+    come from `view_class`; the JWT user lookup and the queries are awaited,
+    so one ASGI worker can serve other clients while they run. Serializers
+    run in a worker thread, where any related row they load is safe to
+    query. Session authentication is not supported.
+    """
+    view_class = None
+    http_method_names = ['get', 'options']
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Django refuses ATOMIC_REQUESTS for async views; these only read.
+        return transaction.non_atomic_requests(super().as_view(**initkwargs))
+
+    async def get(self, request, *args, **kwargs):
+        view = self.view_class(args=args, kwargs=kwargs, format_kwarg=None,
+                               pagination_class=AsyncLimitOffsetPagination)
+        request = view.initialize_request(request, *args, **kwargs)
+        view.request = request
+        view.headers = view.default_response_headers
+        try:
+            await self.authenticate(request)
+            view.initial(request, *args, **kwargs)
+            response = await self.get_response(view, request)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+        return view.finalize_response(request, response, *args, **kwargs)
+
+    async def authenticate(self, request):
+        request.user, request.auth = AnonymousUser(), None
+        request._authenticator = None
+        for authenticator in request.authenticators:
+            if isinstance(authenticator, JWTAuthentication):
+                result = await authenticate_async(authenticator, request)
+                if result is not None:
+                    request._authenticator = authenticator
+                    request.user, request.auth = result
+                    return
+
+    async def get_response(self, view, request):
+        return Response(await self.get_data(view, request))
+
+    async def get_data(self, view, request):
+        queryset = view.filter_queryset(view.get_queryset())
+        page = await view.paginator.apaginate_queryset(queryset, request, view=view)
+        if page is None:
+            return await self.serialize(view, [obj async for obj in queryset])
+        return view.paginator.get_paginated_response(await self.serialize(view, page)).data
+
+    async def serialize(self, view, objects):
+        return await sync_to_async(lambda: view.get_serializer(objects, many=True).data)()
+
+
+class AsyncStadiumListAPIView(AsyncReadAPIView):
+    view_class = StadiumListAPIView
+
+    async def get_response(self, view, request):
+        etag, last_modified = await aget_stadium_list_validators(request, view.aget_validators)
+        not_modified = conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        data = await aget_stadium_list(request, lambda: self.get_data(view, request))
+        return set_validators(Response(data), etag, last_modified)
+
+
+class AsyncStadiumStatsCountAPIView(AsyncReadAPIView):
+    view_class = StadiumStatsCountAPIView
+
+    async def get_data(self, view, request):
+        return view.serialize(await models.StadiumCounter.aget())
+
+
+class AsyncOwnerBronListAPIView(AsyncReadAPIView):
+    view_class = OwnerBronListAPIView
+
+
+class AsyncOwnerStadiumStatsView(AsyncReadAPIView):
+    view_class = OwnerStadiumStatsView
@@ -0,0 +1,230 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import SessionAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .models import User
+from .tokens import ROLE_CLAIM, VERSION_CLAIM, RoleTokenUser
+
+
+class UserCache:
+    """
+    Users by token id: a per-process LRU kept for AUTH_USER_LOCAL_CACHE_TIMEOUT
+    seconds in front of the shared cache, which keeps them for
+    AUTH_USER_CACHE_TIMEOUT. Saving or deleting a user drops both entries
+    in this process; other processes notice once their local entry expires.
+
+    Cached users are loaded without their password hash. QuerySet.update(),
+    bulk_update() and bulk_create() send no signals, so code that changes
+    users that way must call invalidate() for each of them, as
+    bump_token_versions() does; otherwise the old values stay cached until
+    AUTH_USER_CACHE_TIMEOUT.
+    """
+
+    def __init__(self):
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(user_id):
+        return f"auth-user:{user_id}"
+
+    @staticmethod
+    def _queryset(user_id):
+        users = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).defer('password')
+        if api_settings.CHECK_REVOKE_TOKEN:
+            users = users.annotate(password_hash=F('password'))
+        return users
+
+    @staticmethod
+    def _without_password(user):
+        # Token revocation only needs the digest of the hash, never the hash itself.
+        password_hash = user.__dict__.pop('password_hash', None)
+        if password_hash is not None:
+            user.password_digest = get_md5_hash_password(password_hash)
+        return user
+
+    def _get_local(self, user_id):
+        with self._lock:
+            entry = self._local.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires < time.monotonic():
+                del self._local[user_id]
+                return None
+            self._local.move_to_end(user_id)
+            return user
+
+    def _set_local(self, user_id, user):
+        with self._lock:
+            self._local[user_id] = (time.monotonic() + settings.AUTH_USER_LOCAL_CACHE_TIMEOUT, user)
+            self._local.move_to_end(user_id)
+            while len(self._local) > settings.AUTH_USER_LOCAL_CACHE_SIZE:
+                self._local.popitem(last=False)
+
+    def get(self, user_id):
+        user_id = str(user_id)
+        user = self._get_local(user_id)
+        if user is None:
+            user = cache.get(self.key(user_id))
+            if user is None:
+                user = self._queryset(user_id).first()
+                if user is None:
+                    return None
+                user = self._without_password(user)
+                cache.set(self.key(user_id), user, settings.AUTH_USER_CACHE_TIMEOUT)
+            self._set_local(user_id, user)
+        # Requests get their own instance so changes made to request.user stay local.
+        return copy.copy(user)
+
+    async def aget(self, user_id):
+        user_id = str(user_id)
+        user = self._get_local(user_id)
+        if user is None:
+            user = await cache.aget(self.key(user_id))
+            if user is None:
+                user = await self._queryset(user_id).afirst()
+                if user is None:
+                    return None
+                user = self._without_password(user)
+                await cache.aset(self.key(user_id), user, settings.AUTH_USER_CACHE_TIMEOUT)
+            self._set_local(user_id, user)
+        return copy.copy(user)
+
+    def invalidate(self, user_id):
+        user_id = str(user_id)
+        with self._lock:
+            self._local.pop(user_id, None)
+        cache.delete(self.key(user_id))
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+
+
+user_cache = UserCache()
+
+
+def _token_version_key(user_id):
+    return f"token-version:{user_id}"
+
+
+def get_token_version(user_id):
+    """
+    The user's current token_version, kept only in the shared cache so every
+    process sees a bump at once; None for unknown users. A miss loads the
+    user through user_cache, which a stale token then falls back to anyway.
+    """
+    key = _token_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        user = user_cache.get(user_id)
+        if user is None:
+            return None
+        version = user.token_version
+        cache.set(key, version, settings.AUTH_USER_CACHE_TIMEOUT)
+    return version
+
+
+async def aget_token_version(user_id):
+    key = _token_version_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        user = await user_cache.aget(user_id)
+        if user is None:
+            return None
+        version = user.token_version
+        await cache.aset(key, version, settings.AUTH_USER_CACHE_TIMEOUT)
+    return version
+
+
+def invalidate_token_version(user_id):
+    cache.delete(_token_version_key(user_id))
+
+
+def get_token_user_id(validated_token):
+    try:
+        return validated_token[api_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise InvalidToken(_("Token contained no recognizable user identification"))
+
+
+def check_token_user(validated_token, user):
+    """The checks JWTAuthentication.get_user() applies once the user is loaded."""
+    if user is None:
+        raise AuthenticationFailed(_("User not found"), code="user_not_found")
+    if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != (
+            getattr(user, 'password_digest', None) or get_md5_hash_password(user.password)):
+        raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that loads request.user through user_cache."""
+
+    def get_user(self, validated_token):
+        return check_token_user(validated_token, user_cache.get(get_token_user_id(validated_token)))
+
+    async def aget_user(self, validated_token):
+        return check_token_user(validated_token, await user_cache.aget(get_token_user_id(validated_token)))
+
+
+class RoleClaimJWTAuthentication(CachedJWTAuthentication):
+    """
+    For views that only need the user's id, role and stadiums: a token with
+    role claims becomes a RoleTokenUser, as long as its version matches the
+    user's current token_version. Stale or plain tokens fall back to loading
+    the user.
+    """
+
+    @staticmethod
+    def has_role_claims(validated_token):
+        return settings.JWT_ROLE_CLAIMS and ROLE_CLAIM in validated_token
+
+    def get_user(self, validated_token):
+        if self.has_role_claims(validated_token) and (
+                validated_token.get(VERSION_CLAIM) == get_token_version(get_token_user_id(validated_token))):
+            return RoleTokenUser(validated_token)
+        return super().get_user(validated_token)
+
+    async def aget_user(self, validated_token):
+        if self.has_role_claims(validated_token) and (
+                validated_token.get(VERSION_CLAIM) == await aget_token_version(get_token_user_id(validated_token))):
+            return RoleTokenUser(validated_token)
+        return await super().aget_user(validated_token)
+
+
+ROLE_CLAIM_AUTHENTICATION = [RoleClaimJWTAuthentication, SessionAuthentication]
+
+
+async def authenticate_async(authenticator, request):
+    """
+    Awaitable counterpart of JWTAuthentication.authenticate(): the token is
+    checked in memory and only the user lookup touches the database.
+    Returns (user, token) or None when the request carries no token.
+    """
+    header = authenticator.get_header(request)
+    if header is None:
+        return None
+    raw_token = authenticator.get_raw_token(header)
+    if raw_token is None:
+        return None
+    validated_token = authenticator.get_validated_token(raw_token)
+
+    if isinstance(authenticator, CachedJWTAuthentication):
+        return await authenticator.aget_user(validated_token), validated_token
+    user = await User.objects.filter(**{api_settings.USER_ID_FIELD: get_token_user_id(validated_token)}).afirst()
+    return check_token_user(validated_token, user), validated_token
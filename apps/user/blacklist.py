@@ -0,0 +1,106 @@
+import math
+import threading
+import time
+from hashlib import blake2b
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Q
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+GENERATION_KEY = "token-blacklist:generation"
+# How long a skipped BlacklistedToken id is re-checked: a transaction that took
+# the id may commit after rows with higher ids were already loaded.
+GAP_SECONDS = 300
+RECENT_IDS = 1000
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray(math.ceil(self.size / 8))
+        self.count = 0
+
+    def _positions(self, item):
+        digest = blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class BlacklistFilter:
+    """
+    Process-wide Bloom filter of blacklisted refresh-token JTIs. A token
+    outside the filter is certainly not blacklisted; one inside it may be,
+    and is checked against the database.
+
+    Every new BlacklistedToken bumps a generation key in the shared cache,
+    and the filter then loads the rows added since its last sync. It is
+    rebuilt from scratch when it fills up.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._generation = None
+        self._last_id = 0
+        self._gaps = {}
+
+    def might_contain(self, jti):
+        self.sync()
+        return jti in self._bloom
+
+    def sync(self):
+        generation = cache.get_or_set(GENERATION_KEY, time.time_ns(), None)
+        if self._bloom is not None and generation == self._generation:
+            return
+        with self._lock:
+            if self._bloom is None or self._bloom.count >= self._bloom.capacity:
+                self._rebuild()
+            else:
+                self._load_new()
+            self._generation = generation
+
+    @staticmethod
+    def _rows(condition):
+        return BlacklistedToken.objects.filter(condition).order_by('id').values_list('id', 'token__jti').iterator()
+
+    def _rebuild(self):
+        totals = BlacklistedToken.objects.aggregate(count=Count('id'), top=Max('id'))
+        self._bloom = BloomFilter(max(totals['count'] * 2, settings.TOKEN_BLACKLIST_FILTER_CAPACITY),
+                                  settings.TOKEN_BLACKLIST_FILTER_ERROR_RATE)
+        # Only the newest ids can still belong to uncommitted transactions.
+        self._last_id = max((totals['top'] or 0) - RECENT_IDS, 0)
+        self._gaps = {}
+        for _, jti in self._rows(Q(id__lte=self._last_id)):
+            self._bloom.add(jti)
+        self._load_new()
+
+    def _load_new(self):
+        now = time.monotonic()
+        self._gaps = {gap: seen for gap, seen in self._gaps.items() if now - seen < GAP_SECONDS}
+        for row_id, jti in self._rows(Q(id__gt=self._last_id) | Q(id__in=list(self._gaps))):
+            self._bloom.add(jti)
+            self._gaps.pop(row_id, None)
+            if row_id > self._last_id:
+                self._gaps.update(dict.fromkeys(range(self._last_id + 1, row_id), now))
+                self._last_id = row_id
+
+    def changed(self):
+        cache.set(GENERATION_KEY, time.time_ns(), None)
+
+    def clear(self):
+        with self._lock:
+            self._bloom = None
+
+
+blacklist_filter = BlacklistFilter()
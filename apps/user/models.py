@@ -1,9 +1,10 @@
 from django.core.validators import RegexValidator
 from django.db import models
 from django.utils import timezone
-from rest_framework_simplejwt.tokens import RefreshToken
+from .tokens import RefreshToken, access_token_for
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
+from core.tracking import LoadedValuesMixin
 
 
 class CustomerUserManager(BaseUserManager):
@@ -27,11 +28,15 @@ class CustomerUserManager(BaseUserManager):
         return self.create_user(phone_number, password, **extra_fields)
 
 
+# Fields signed into role-carrying access tokens, or checked when they are
+# issued; changing any of them makes existing tokens stale.
+TOKEN_CLAIM_FIELDS = ('role', 'is_active', 'password')
+
 phone_validator = RegexValidator(
     regex=r"^\+998\d{9}$", message=_("Phone number format should be +998 followed by 9 digits"), code='invalid'
 )
 
-class User(AbstractBaseUser, PermissionsMixin):
+class User(LoadedValuesMixin, AbstractBaseUser, PermissionsMixin):
     REQUIRED_FIELDS = []
     email = None
     username = None
@@ -48,6 +53,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     date_joined = models.DateTimeField(default=timezone.now)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=True)
+    token_version = models.PositiveIntegerField(default=0, editable=False)
 
     objects = CustomerUserManager()
 
@@ -64,11 +70,32 @@ class User(AbstractBaseUser, PermissionsMixin):
         blank=True,
     )
 
+    def save(self, *args, **kwargs):
+        loaded = self.loaded_values(TOKEN_CLAIM_FIELDS)
+        bump = bool(loaded) and loaded != {field: self.__dict__.get(field) for field in loaded}
+        if bump:
+            # Stadium changes bump the version with a queryset update, so this copy may be behind.
+            self.token_version = models.F('token_version') + 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        if bump:
+            self.refresh_from_db(fields=['token_version'])
+
+    @property
+    def stadium_ids(self):
+        if self.role == self.RoleType.OWNER:
+            return self.stadium_owner.values_list('id', flat=True)
+        if self.role == self.RoleType.MANAGER:
+            return self.stadium_manager.values_list('id', flat=True)
+        return []
+
     def tokens(self):
         refresh = RefreshToken.for_user(self)
         return {
             "refresh": str(refresh),
-            "access": str(refresh.access_token),
+            "access": str(access_token_for(self, refresh)),
         }
 
     def __str__(self):
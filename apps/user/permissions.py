@@ -10,7 +10,7 @@ class IsOwnerUser(BasePermission):
         return bool(request.user and request.user.is_authenticated and request.user.role == 'owner')
 
     def has_object_permission(self, request, view, obj):
-        return obj.owner == request.user
+        return obj.owner_id == request.user.id
 
 class IsManager(BasePermission):
     def has_permission(self, request, view):
@@ -1,8 +1,10 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from .models import User
 from django.utils.translation import gettext_lazy as _
 from phonenumber_field.serializerfields import PhoneNumberField
-from rest_framework_simplejwt.tokens import RefreshToken, TokenError, AccessToken
+from rest_framework_simplejwt.tokens import TokenError, AccessToken
+from .tokens import RefreshToken
 
 
 class RegisterSerializers(serializers.ModelSerializer):
@@ -14,21 +16,23 @@ class RegisterSerializers(serializers.ModelSerializer):
         model = User
         fields = ['full_name', 'phone_number', 'password']
 
-    def validate_phone_number(self, value):
-        if User.objects.filter(phone_number=value).exists():
+    def create(self, validated_data):
+        # The unique constraint on phone_number is the duplicate check.
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    full_name=validated_data["full_name"],
+                    phone_number=validated_data["phone_number"],
+                    password=validated_data["password"]
+                )
+        except IntegrityError:
             raise serializers.ValidationError(
                 {
-                    "message": [_("This phone number is already registered")]
+                    "phone_number": {
+                        "message": [_("This phone number is already registered")]
+                    }
                 }
             )
-        return value
-
-    def create(self, validated_data):
-        user = User.objects.create_user(
-            full_name=validated_data["full_name"],
-            phone_number=validated_data["phone_number"],
-            password=validated_data["password"]
-        )
         return user
 
     def to_representation(self, instance):
@@ -44,12 +48,13 @@ class LoginSerializers(serializers.Serializer):
     def validate(self, attrs):
         password = attrs.get('password')
         phone_number = attrs.get('phone_number')
-        user_qs = User.objects.filter(phone_number=phone_number)
+        user = User.objects.filter(phone_number=phone_number).first()
 
-        if not user_qs.exists():
+        if user is None:
+            # Hash anyway so unknown numbers take as long as wrong passwords.
+            User().set_password(password)
             raise serializers.ValidationError({'message': _('User not found')})
 
-        user = user_qs.first()
         if not user.check_password(password):
             raise serializers.ValidationError({'message': _('The password is incorrect')})
 
@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .authentication import invalidate_token_version, user_cache
+from .blacklist import blacklist_filter
+from .models import User
+
+
+def invalidate_user(user_id):
+    user_cache.invalidate(user_id)
+    invalidate_token_version(user_id)
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Drop now so this transaction reads fresh, and again on commit in case
+    # a concurrent request cached the old row in between.
+    user_id = getattr(instance, api_settings.USER_ID_FIELD)
+    invalidate_user(user_id)
+    transaction.on_commit(lambda: invalidate_user(user_id))
+
+
+def bump_token_versions(user_ids):
+    """Makes role claims already issued to these users stale, e.g. after their stadiums change."""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    User.objects.filter(pk__in=user_ids).update(token_version=F('token_version') + 1)
+    for user_id in user_ids:
+        invalidate_user(user_id)
+    transaction.on_commit(lambda: [invalidate_user(user_id) for user_id in user_ids])
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def token_blacklisted(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(blacklist_filter.changed)
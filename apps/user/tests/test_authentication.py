@@ -0,0 +1,87 @@
+from rest_framework import status
+from rest_framework.test import APITestCase, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from apps.user.authentication import CachedJWTAuthentication, user_cache
+from unittest import mock
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.user = User.objects.create_user(phone_number='+998922222222', password='password02', role='owner')
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.factory = APIRequestFactory()
+
+    def authenticate(self):
+        request = self.factory.get('/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        return CachedJWTAuthentication().authenticate(request)[0]
+
+    def test_repeated_requests_skip_the_user_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authenticate(), self.user)
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+        self.assertEqual(user.role, 'owner')
+
+    def test_shared_cache_is_used_when_process_cache_misses(self):
+        self.authenticate()
+        user_cache.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate(), self.user)
+
+    def test_requests_get_their_own_instance(self):
+        self.authenticate().role = 'admin'
+        self.assertEqual(self.authenticate().role, 'owner')
+
+    def test_saving_the_user_invalidates(self):
+        self.authenticate()
+        self.user.role = 'manager'
+        self.user.save()
+        self.assertEqual(self.authenticate().role, 'manager')
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_deleting_the_user_invalidates(self):
+        self.authenticate()
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_password_hash_is_not_cached(self):
+        self.authenticate()
+        self.assertNotIn('password', cache.get(user_cache.key(self.user.id)).__dict__)
+
+        user = self.authenticate()
+        user.full_name = 'Cached User'
+        user.save()
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password('password02'))
+
+    def test_revoked_token_is_rejected(self):
+        with mock.patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True):
+            self.token = str(RefreshToken.for_user(self.user).access_token)
+            self.authenticate()
+            with self.assertNumQueries(0):
+                self.assertEqual(self.authenticate(), self.user)
+            self.user.set_password('password03')
+            self.user.save()
+            with self.assertRaises(AuthenticationFailed):
+                self.authenticate()
+
+    def test_role_change_applies_to_permissions(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        url = reverse('owner-stadium-statistic')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.user.role = 'user'
+        self.user.save()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
@@ -8,6 +8,7 @@ from apps.user.permissions import IsAdminUser, IsOwnerUser, IsManager
 class DummyObject:
     def __init__(self, owner):
         self.owner = owner
+        self.owner_id = owner.id
 
 
 class PermissionTests(TestCase):
@@ -0,0 +1,105 @@
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from apps.common.models import Stadium
+from apps.user.authentication import user_cache
+
+User = get_user_model()
+
+
+@override_settings(JWT_ROLE_CLAIMS=True)
+class RoleClaimTokenTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.admin = User.objects.create_user(phone_number='+998977777777', password='password07', role='admin')
+        self.owner = User.objects.create_user(phone_number='+998911111111', password='password01', role='owner')
+        self.user = User.objects.create_user(phone_number='+998922222222', password='password02', role='user')
+        self.stadium = Stadium.objects.create(
+            owner=self.owner, name='Test Stadium', latitude='12.3459', longitude='-34.9876', price_hour='13000.00'
+        )
+        self.client = APIClient()
+
+    def login(self, user):
+        tokens = User.objects.get(pk=user.pk).tokens()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        return tokens
+
+    def assertNoUserLookup(self, url):
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertFalse([q['sql'] for q in queries if 'user_user' in q['sql']])
+        return response
+
+    def test_access_token_carries_role_and_stadiums(self):
+        token = AccessToken(self.login(self.owner)['access'])
+        self.assertEqual(token['role'], 'owner')
+        self.assertEqual(token['stadiums'], [self.stadium.id])
+        self.assertNotIn('stadiums', AccessToken(self.login(self.user)['access']))
+
+    def test_role_views_authorise_from_the_token(self):
+        self.login(self.owner)
+        response = self.assertNoUserLookup(reverse('owner-stadium-statistic'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in response.data['results']], [self.stadium.id])
+        self.assertEqual(self.assertNoUserLookup(reverse('owner-bron-list')).status_code, status.HTTP_200_OK)
+
+        self.login(self.admin)
+        self.assertEqual(self.assertNoUserLookup(reverse('status-count')).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.assertNoUserLookup(reverse('owner-bron-list')).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_role_change_makes_claims_stale(self):
+        self.login(self.owner)
+        self.owner.role = 'user'
+        self.owner.save()
+        response = self.client.get(reverse('owner-stadium-statistic'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_promotion_by_admin(self):
+        tokens = self.login(self.user)
+        self.assertEqual(AccessToken(tokens['access'])['role'], 'user')
+
+        admin_client = APIClient()
+        admin_client.force_authenticate(user=self.admin)
+        response = admin_client.post('/api/v1/common/stadium/', {
+            'name': 'Promoted Stadium', 'latitude': '12.3459', 'longitude': '-34.9876',
+            'price_hour': '13000.00', 'owner': self.user.id
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get(reverse('owner-stadium-statistic'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+
+        response = self.client.post(reverse('token-refresh'), {'refresh': tokens['refresh']}, format='json')
+        token = AccessToken(response.data['access'])
+        self.assertEqual(token['role'], 'owner')
+        self.assertEqual(token['stadiums'], [Stadium.objects.get(name='Promoted Stadium').id])
+
+    def test_new_stadium_makes_owner_claims_stale(self):
+        self.login(self.owner)
+        Stadium.objects.create(
+            owner=self.owner, name='Second Stadium', latitude='12.3459', longitude='-34.9876', price_hour='13000.00'
+        )
+        response = self.client.get(reverse('owner-stadium-statistic'))
+        self.assertEqual(response.data['count'], 2)
+
+    def test_deactivated_user_is_rejected(self):
+        self.login(self.owner)
+        self.owner.is_active = False
+        self.owner.save()
+        response = self.client.get(reverse('owner-bron-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(JWT_ROLE_CLAIMS=False)
+    def test_plain_tokens_when_switched_off(self):
+        token = AccessToken(self.login(self.owner)['access'])
+        self.assertNotIn('role', token)
+        self.assertEqual(self.client.get(reverse('owner-bron-list')).status_code, status.HTTP_200_OK)
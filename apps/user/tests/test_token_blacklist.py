@@ -0,0 +1,97 @@
+from datetime import timedelta
+from io import StringIO
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from apps.user.blacklist import BloomFilter, blacklist_filter
+from apps.user.tokens import RefreshToken
+
+User = get_user_model()
+
+
+class BloomFilterTest(APITestCase):
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        items = [f'jti-{i}' for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+        self.assertTrue(all(item in bloom for item in items))
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class TokenBlacklistFilterTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        blacklist_filter.clear()
+        self.user = User.objects.create_user(phone_number='+998932004877', password='test2004')
+        self.refresh = str(RefreshToken.for_user(self.user))
+
+    def blacklist_queries(self, refresh):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('token-refresh'), {'refresh': refresh}, format='json')
+        return response, [q['sql'] for q in queries if 'token_blacklist_blacklistedtoken' in q['sql']]
+
+    def test_refresh_skips_blacklist_query(self):
+        self.blacklist_queries(self.refresh)
+        response, queries = self.blacklist_queries(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, [])
+
+    def test_logged_out_token_is_rejected(self):
+        self.blacklist_queries(self.refresh)
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('logout'), {'refresh': self.refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.post(reverse('token-refresh'), {'refresh': self.refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        other = str(RefreshToken.for_user(self.user))
+        self.assertEqual(self.client.post(reverse('token-refresh'), {'refresh': other}).status_code, status.HTTP_200_OK)
+
+    def test_blacklisting_elsewhere_is_picked_up(self):
+        self.blacklist_queries(self.refresh)
+        token = RefreshToken(self.refresh)
+        with self.captureOnCommitCallbacks(execute=True):
+            BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=token['jti']))
+        response, queries = self.blacklist_queries(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(queries)
+
+    def test_late_commit_below_loaded_ids_is_picked_up(self):
+        tokens = [RefreshToken.for_user(self.user) for _ in range(3)]
+        outstanding = [OutstandingToken.objects.get(jti=token['jti']) for token in tokens]
+        first = BlacklistedToken.objects.create(token=outstanding[0])
+        BlacklistedToken.objects.create(id=first.id + 2, token=outstanding[2])
+        blacklist_filter.changed()
+        self.assertFalse(blacklist_filter.might_contain(tokens[1]['jti']))
+
+        BlacklistedToken.objects.create(id=first.id + 1, token=outstanding[1])
+        blacklist_filter.changed()
+        self.assertTrue(blacklist_filter.might_contain(tokens[1]['jti']))
+
+
+class PurgeExpiredTokensCommandTest(APITestCase):
+    def test_deletes_only_expired_tokens(self):
+        user = User.objects.create_user(phone_number='+998932004877', password='test2004')
+        now = timezone.now()
+        for i in range(5):
+            token = OutstandingToken.objects.create(user=user, jti=f'expired-{i}', token='x',
+                                                    expires_at=now - timedelta(days=1))
+            if i % 2 == 0:
+                BlacklistedToken.objects.create(token=token)
+        OutstandingToken.objects.create(user=user, jti='live', token='x', expires_at=now + timedelta(days=1))
+
+        out = StringIO()
+        call_command('purge_expired_tokens', '--batch-size', '2', stdout=out)
+        self.assertIn('Deleted 5 expired outstanding tokens and 3 blacklisted tokens', out.getvalue())
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), ['live'])
+        self.assertFalse(BlacklistedToken.objects.exists())
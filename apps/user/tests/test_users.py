@@ -2,6 +2,11 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from unittest import mock
+from apps.user.hashers import PBKDF2PasswordHasher
 
 User = get_user_model()
 
@@ -88,3 +93,36 @@ class UserTest(APITestCase):
                       str(response.data['phone_number']['message'][0]))
 
 
+
+    def test_user_login_looks_up_user_once(self):
+        data = {
+            'phone_number': '+998932004877',
+            'password': 'test2004',
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.login_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len([q for q in queries if q['sql'].startswith('SELECT') and '"user_user"' in q['sql']]), 1)
+
+    def test_user_login_unknown_user_still_hashes(self):
+        data = {
+            'phone_number': '+998932000000',
+            'password': 'test2004',
+        }
+        with mock.patch.object(PBKDF2PasswordHasher, 'encode', autospec=True,
+                               side_effect=PBKDF2PasswordHasher.encode) as encode:
+            response = self.client.post(self.login_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        encode.assert_called_once()
+
+    def test_user_login_upgrades_password_hash(self):
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+            data = {
+                'phone_number': '+998932004877',
+                'password': 'test2004',
+            }
+            response = self.client.post(self.login_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+        self.assertTrue(self.user.check_password('test2004'))
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from .blacklist import blacklist_filter
+
+ROLE_CLAIM = 'role'
+VERSION_CLAIM = 'ver'
+STADIUMS_CLAIM = 'stadiums'
+
+
+class RefreshToken(BaseRefreshToken):
+    """Skips the blacklist query for tokens the blacklist filter has never seen."""
+
+    def check_blacklist(self):
+        if blacklist_filter.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+
+def add_role_claims(token, user):
+    token[ROLE_CLAIM] = user.role
+    token[VERSION_CLAIM] = user.token_version
+    stadium_ids = list(user.stadium_ids)
+    if stadium_ids:
+        token[STADIUMS_CLAIM] = stadium_ids
+    return token
+
+
+def access_token_for(user, refresh):
+    """The access token of `refresh`, carrying role claims when JWT_ROLE_CLAIMS is on."""
+    access = refresh.access_token
+    if settings.JWT_ROLE_CLAIMS:
+        add_role_claims(access, user)
+    return access
+
+
+class RoleTokenUser(TokenUser):
+    """A user built from the role claims of an access token, without a database lookup."""
+
+    @cached_property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+
+    @cached_property
+    def token_version(self):
+        return self.token[VERSION_CLAIM]
+
+    @cached_property
+    def stadium_ids(self):
+        return self.token.get(STADIUMS_CLAIM, [])
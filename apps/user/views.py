@@ -1,7 +1,6 @@
 from django.shortcuts import render
 from rest_framework import generics, status, permissions
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from .serializers import RegisterSerializers, LoginSerializers, LogoutSerializer
@@ -9,6 +8,10 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from django.contrib.auth.password_validation import validate_password
 from rest_framework.response import Response
+from rest_framework_simplejwt.settings import api_settings
+from django.conf import settings
+from .models import User
+from .tokens import RefreshToken, access_token_for
 
 
 class RegisterAPIView(generics.CreateAPIView):
@@ -46,7 +49,12 @@ class CustomTokenRefreshView(TokenRefreshView):
 
         try:
             refresh = RefreshToken(refresh_token)
-            new_access_token = str(refresh.access_token)
+            if settings.JWT_ROLE_CLAIMS:
+                # Role claims are minted from the current user, not copied from the refresh token.
+                user = User.objects.get(pk=refresh[api_settings.USER_ID_CLAIM], is_active=True)
+                new_access_token = str(access_token_for(user, refresh))
+            else:
+                new_access_token = str(refresh.access_token)
             return Response({"access": new_access_token})
         except Exception as e:
             return Response({"detail": str(e)}, status=400)
@@ -0,0 +1,116 @@
+import re
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+# Transaction bookkeeping issued by atomic blocks, not by the view itself.
+TRANSACTION_RE = re.compile(r'\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE SAVEPOINT)\b', re.IGNORECASE)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def get_query_budget(view):
+    """
+    The query_budget of a view class or of the view behind an as_view()
+    function. Async fronts declare none and answer with the budget of the
+    DRF view they wrap.
+    """
+    while view is not None:
+        budget = getattr(view, 'query_budget', None)
+        if budget is not None:
+            return budget
+        # as_view() keeps the class on the returned function as .view_class.
+        view = getattr(view, 'view_class', None)
+    return None
+
+
+class QueryCounter:
+    """Records the SQL sent on every database connection while active."""
+
+    def __init__(self):
+        self.queries = []
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        if not TRANSACTION_RE.match(sql):
+            self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def __len__(self):
+        return len(self.queries)
+
+
+def budget_error(view, budget, queries):
+    lines = '\n'.join(f'{number}. {sql}' for number, sql in enumerate(queries, 1))
+    return f'{view} issued {len(queries)} queries, its budget is {budget}:\n{lines}'
+
+
+class QueryBudgetMiddleware:
+    """
+    Raises QueryBudgetExceeded when a view with a declared query_budget
+    issues more queries than that while serving a request. Enabled by
+    QUERY_BUDGET_ENFORCE, which defaults to DEBUG.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.QUERY_BUDGET_ENFORCE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with QueryCounter() as counter:
+            response = self.get_response(request)
+        self.check(request, counter)
+        return response
+
+    async def __acall__(self, request):
+        # The async ORM queries through thread-sensitive sync_to_async, so the
+        # counter is installed on the connections of that same thread.
+        counter = QueryCounter()
+        await sync_to_async(counter.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(counter.__exit__)(None, None, None)
+        self.check(request, counter)
+        return response
+
+    def check(self, request, counter):
+        match = request.resolver_match
+        budget = get_query_budget(match.func) if match is not None else None
+        if budget is not None and len(counter) > budget:
+            raise QueryBudgetExceeded(budget_error(request.path, budget, counter.queries))
+
+
+class QueryBudgetTestMixin:
+    """TestCase mixin checking the queries a block issues against a view's budget."""
+
+    @contextmanager
+    def assertWithinQueryBudget(self, view):
+        budget = get_query_budget(view)
+        if budget is None:
+            self.fail(f'{view} declares no query_budget')
+        with QueryCounter() as counter:
+            yield counter
+        if len(counter) > budget:
+            self.fail(budget_error(view.__name__, budget, counter.queries))
@@ -0,0 +1,30 @@
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from rest_framework.renderers import JSONRenderer
+
+if orjson is not None:
+    # Datetimes go through DRF's encoder, which writes UTC as 'Z' and keeps milliseconds.
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes compact UTF-8 output with orjson when it is
+    installed, byte for byte like DRF's encoder. Values orjson leaves alone
+    (Decimal, datetimes, lazy strings, querysets...) are converted by DRF's
+    JSONEncoder.default, so they render exactly as before.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        # Same escaping of U+2028/U+2029 as JSONRenderer.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -60,7 +60,7 @@ THIRD_PARTY_APPS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.user.authentication.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
     "DEFAULT_FILTER_BACKENDS": (
@@ -69,12 +69,17 @@ REST_FRAMEWORK = {
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 10,
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
 }
 
 INSTALLED_APPS = DJANGO_APPS + CUSTOM_APPS + THIRD_PARTY_APPS
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -82,6 +87,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.query_budget.QueryBudgetMiddleware",
+    "core.db_router.ReplicaPinMiddleware",
 ]
 
 ROOT_URLCONF = "core.urls"
@@ -119,6 +126,21 @@ DATABASES = {
     }
 }
 
+# Optional read replica; see core.db_router for which requests use it.
+if env.str("DB_REPLICA_HOST", ""):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": env.str("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "HOST": env.str("DB_REPLICA_HOST"),
+        "PORT": env.str("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "ATOMIC_REQUESTS": False,
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+# Seconds after a write during which the writer's reads stay on the primary.
+REPLICA_PIN_SECONDS = env.int("REPLICA_PIN_SECONDS", 5)
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -137,6 +159,18 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# The first hasher encodes new passwords; the others only verify existing hashes,
+# which are re-encoded with the first one on the next successful login.
+PASSWORD_PBKDF2_ITERATIONS = env.int("PASSWORD_PBKDF2_ITERATIONS", 1_000_000)
+PASSWORD_HASHERS = list(dict.fromkeys([
+    env.str("PASSWORD_HASHER", "apps.user.hashers.PBKDF2PasswordHasher"),
+    "apps.user.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]))
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.1/topics/i18n/
 
@@ -166,7 +200,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # CACHES
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "BACKEND": env.str("CACHE_BACKEND", "django.core.cache.backends.redis.RedisCache"),
         "LOCATION": f"{env.str('REDIS_URL', 'redis://localhost:6379/0')}",
         "KEY_PREFIX": "boilerplate",  # todo: you must change this with your project name or something else
     }
@@ -179,10 +213,37 @@ CELERY_RESULT_BACKEND = env.str("CELERY_BROKER_URL", "redis://localhost:6379")
 CELERY_TIMEZONE = "Asia/Tashkent"
 
 CELERY_TASK_TRACK_STARTED = True
+CELERY_TASK_ALWAYS_EAGER = env.bool("CELERY_TASK_ALWAYS_EAGER", False)
+CELERY_TASK_EAGER_PROPAGATES = False
 CELERY_TASK_TIME_LIMIT = 30 * 60
 
 AUTH_USER_MODEL = 'user.User'
 
+# BOOKING
+BRON_SLOT_INDEX_TTL = env.int("BRON_SLOT_INDEX_TTL", 60)  # seconds a loaded day bitmap is trusted
+FREE_SLOTS_CACHE_TIMEOUT = env.int("FREE_SLOTS_CACHE_TIMEOUT", 60)
+STADIUM_LIST_CACHE_TIMEOUT = env.int("STADIUM_LIST_CACHE_TIMEOUT", 300)
+# Authenticated users are cached in the shared cache and, more briefly, in each process.
+AUTH_USER_CACHE_TIMEOUT = env.int("AUTH_USER_CACHE_TIMEOUT", 60)
+AUTH_USER_LOCAL_CACHE_TIMEOUT = env.int("AUTH_USER_LOCAL_CACHE_TIMEOUT", 5)
+AUTH_USER_LOCAL_CACHE_SIZE = env.int("AUTH_USER_LOCAL_CACHE_SIZE", 10000)
+# Sign role and stadium ids into access tokens so role-only views skip the user lookup.
+JWT_ROLE_CLAIMS = env.bool("JWT_ROLE_CLAIMS", False)
+# Sizing of the in-process Bloom filter of blacklisted refresh tokens.
+TOKEN_BLACKLIST_FILTER_CAPACITY = env.int("TOKEN_BLACKLIST_FILTER_CAPACITY", 100000)
+TOKEN_BLACKLIST_FILTER_ERROR_RATE = env.float("TOKEN_BLACKLIST_FILTER_ERROR_RATE", 0.001)
+FREE_SLOTS_MAX_DAYS = 31
+BRON_BULK_MAX_SLOTS = 52
+STADIUM_NEARBY_MAX_RADIUS_KM = 50
+# Stadium image uploads are streamed to disk and dropped once they pass this size.
+STADIUM_IMAGE_MAX_SIZE = env.int("STADIUM_IMAGE_MAX_SIZE", 5 * 1024 * 1024)
+
+# JSON responses smaller than this are sent uncompressed.
+API_COMPRESSION_MIN_SIZE = env.int("API_COMPRESSION_MIN_SIZE", 1024)
+
+# Fail requests whose view issues more queries than its declared query_budget.
+QUERY_BUDGET_ENFORCE = env.bool("QUERY_BUDGET_ENFORCE", DEBUG)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=10),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=30),
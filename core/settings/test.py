@@ -0,0 +1,4 @@
+from .develop import *  # noqa
+
+# Eager tasks raise in tests instead of only being logged.
+CELERY_TASK_EAGER_PROPAGATES = True
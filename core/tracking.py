@@ -0,0 +1,44 @@
+class LoadedValuesMixin:
+    """
+    Model mixin remembering the field values an instance was loaded from the
+    database with, so save() and signal receivers can tell what changed.
+
+    The values are taken in from_db(), which only runs for rows read from the
+    database, and refreshed by save() and refresh_from_db(). An instance
+    built in memory has none until it is first saved.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.mark_loaded(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using, fields, **kwargs)
+        self.mark_loaded(fields)
+
+    def loaded_values(self, fields):
+        """
+        The loaded value of each of `fields` that was loaded (deferred ones
+        are left out), or None for an instance that was never loaded or saved.
+        """
+        loaded = self.__dict__.get('_loaded')
+        if loaded is None:
+            return None
+        return {field: loaded[field] for field in fields if field in loaded}
+
+    def mark_loaded(self, fields=None):
+        names = None if fields is None else set(fields)
+        loaded = self.__dict__.setdefault('_loaded', {})
+        for field in self._meta.concrete_fields:
+            if names is not None and field.name not in names and field.attname not in names:
+                continue
+            value = self.__dict__.get(field.attname)
+            # Deferred fields stay unknown; F() updates are only known after a refresh.
+            if field.attname in self.__dict__ and not hasattr(value, 'resolve_expression'):
+                loaded[field.attname] = value